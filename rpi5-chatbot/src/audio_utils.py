@@ -7,27 +7,126 @@ RPI5 MODIFICATIONS:
 - Device name stability across reboots
 """
 
+# Import config before pygame - it sets SDL's audio driver defaults
+try:
+    import config
+    AUDIO_CONFIG = config.AudioConfig()
+except ImportError:
+    AUDIO_CONFIG = None
+
 import pygame
 import time
 import threading
 import os
+import atexit
 import queue
-from pathlib import Path
+import itertools
+from concurrent.futures import ThreadPoolExecutor
+import fnmatch
+import re
+import mmap
+import io
+from collections import deque
+from dataclasses import dataclass, field
+from functools import lru_cache
 from enum import Enum
 from typing import Optional, Callable
 
-# Import config to get audio device settings
-try:
-    import config
-    AUDIO_CONFIG = config.AudioConfig()
-except ImportError:
-    AUDIO_CONFIG = None
+# How often a playing track is re-checked once its expected end has passed
+# (and throughout streamed music or loops, whose end isn't known up front)
+PLAYBACK_POLL_SECONDS = 0.1
+
+# Files up to this size are decoded into a pygame Sound and played on a
+# reserved channel; larger files are streamed through pygame.mixer.music.
+# Only preloaded prompts stay decoded (self._sfx) - one-off TTS files don't
+SOUND_CACHE_MAX_BYTES = 2 * 1024 * 1024
+
+# Log lines from the playback/state threads go into a bounded ring and are
+# written by a background thread, so those threads never block on stdout.
+# When the ring is full the oldest lines are dropped.
+_LOG_BUFFER = deque(maxlen=1024)
+_log_ready = threading.Event()
+_log_writer = None
+_log_writer_lock = threading.Lock()
+
+def _log(message: str):
+    """Queue a log line for the background writer"""
+    _LOG_BUFFER.append(message)
+    if _log_writer is None:
+        _start_log_writer()
+    _log_ready.set()
+
+def _start_log_writer():
+    """Start the background log writer thread (once)"""
+    global _log_writer
+    with _log_writer_lock:
+        if _log_writer is None:
+            _log_writer = threading.Thread(
+                target=_log_writer_loop,
+                daemon=True,
+                name="AudioLogWriter"
+            )
+            _log_writer.start()
+
+def _log_writer_loop():
+    """Print queued log lines as they arrive"""
+    while True:
+        _log_ready.wait()
+        _log_ready.clear()
+        _flush_log()
+
+def _flush_log():
+    """Print everything currently queued"""
+    while _LOG_BUFFER:
+        try:
+            print(_LOG_BUFFER.popleft())
+        except IndexError:
+            break
+
+# The writer is a daemon thread - don't lose queued lines at exit
+atexit.register(_flush_log)
+
+def _boost_thread_priority(priority: int = 10) -> bool:
+    """
+    Raise the calling thread's scheduling priority (SCHED_FIFO, else nice -10)
+
+    Needs CAP_SYS_NICE, grant it once with:
+        sudo setcap 'cap_sys_nice=eip' $(readlink -f $(which python3))
+
+    Returns:
+        True if either boost was applied
+    """
+    # pid 0 = the calling thread on Linux. Keep the priority modest so the
+    # kernel, SDL's own audio thread and whisper still get scheduled
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        return True
+    except (AttributeError, OSError):
+        pass
+
+    try:
+        os.nice(-10)
+        return True
+    except (AttributeError, OSError):
+        return False
+
+def _set_audio_env(device: str):
+    """Point SDL at an ALSA playback device, skipping variables already set"""
+    for key, value in (('SDL_AUDIODRIVER', 'alsa'), ('AUDIODEV', device)):
+        if os.environ.get(key) != value:
+            os.environ[key] = value  # os.environ also calls putenv() for SDL
 
 class AudioState(Enum):
     IDLE = "idle"
     PLAYING = "playing"
     PAUSED = "paused"
 
+@dataclass(frozen=True, slots=True)
+class AudioCommand:
+    """One queued chunk, passed from the producer to the queue processor"""
+    file: str
+    metadata: dict = field(default_factory=dict)
+
 class AudioPlayer:
     """Handles audio playback with state management - RPI5 Edition"""
 
@@ -36,37 +135,75 @@ class AudioPlayer:
         self.audio_config = audio_config or AUDIO_CONFIG
 
         # Set SDL environment variables for ALSA device selection
-        if self.audio_config and hasattr(self.audio_config, 'playback_device_name'):
-            os.environ['SDL_AUDIODRIVER'] = 'alsa'
-            os.environ['AUDIODEV'] = self.audio_config.playback_device_name
-            print(f"🔊 Audio output: {self.audio_config.playback_device_name}")
-
-        # Initialize pygame mixer
-        pygame.mixer.init(frequency=22050, size=-16, channels=2, buffer=1024)
+        self.output_device = getattr(self.audio_config, 'playback_device_name', None)
+        if self.output_device:
+            _set_audio_env(self.output_device)
+            _log(f"🔊 Audio output: {self.output_device}")
+
+        # pygame mixer is initialized lazily on first playback and shut down
+        # again after a period of idleness - an open mixer keeps SDL's audio
+        # thread polling ALSA even while the bot is only listening
+        self._mixer_ready = False
+        self._mixer_lock = threading.Lock()
+        self._mixer_epoch = 0  # Bumped on every use, invalidates pending shutdowns
+        # One watch thread runs the idle shutdown and keep-warm deadlines, so
+        # rescheduling them after every played chunk doesn't start a thread
+        self._idle_deadline = None  # (monotonic time, mixer epoch) for _shutdown_mixer
+        self._keep_warm_deadline = None  # monotonic time for the next prewarm()
+        self._idle_wake = threading.Event()
+        self._idle_watch = None  # Started on first use
+        self._silence = None  # Short silent Sound used by prewarm()
+        self._tts_channel = None  # Reserved channels, created with the mixer
+        self._loop_channel = None
+        self._active_channel = None  # None = pygame.mixer.music is playing
+        self._sfx = {}  # Preloaded prompts: path -> Sound
+        self._preload_paths = list(getattr(self.audio_config, 'preload_prompts', ()))
+        self._path_cache = {}  # path -> basename for files known to exist
         self.state = AudioState.IDLE
         self.current_file = None
         self.is_playing = False
         self.is_looping = False  # Track loop playback
-        self._playback_thread = None
-        self._stop_event = threading.Event()
+        # One persistent worker runs non-blocking and looped playback jobs
+        self._work_q = queue.Queue()
+        self._worker_idle = threading.Event()
+        self._worker_idle.set()
+        self._playback_thread = threading.Thread(
+            target=self._worker_loop,
+            daemon=True,
+            name="AudioPlaybackWorker"
+        )
+        self._playback_thread.start()
+        # Playback generation: every play/stop takes a new number, and a
+        # playback run only touches shared state while its number is current
+        self._gen_counter = itertools.count(1)
+        self._gen = 0
+        self._finished = threading.Event()  # Doorbell: stop() or a queued command
+        self._track_end = None  # Expected monotonic end of the current Sound, if known
+        self._cmd_q = deque(maxlen=16)  # pause/resume commands for the playback thread
 
         # Queue-based playback system (NEW for streaming)
-        self.playback_queue = queue.Queue()
+        # deque append/popleft are atomic; the event wakes the processor
+        # once per enqueue (or stop/generation-complete) instead of polling
+        self.playback_queue = deque()
+        self._queue_event = threading.Event()
         self.queue_thread = None
         self.is_queue_active = False
-        self.generation_complete = False  # Flag to signal when generation is done
+        self.generation_complete = threading.Event()  # Set when generation is done
         self.enqueued_count = 0  # Track total items enqueued
         self.played_count = 0  # Track total items played
         self.on_chunk_start = None  # Callback when a chunk starts playing
         self.on_queue_complete = None  # Callback when queue finishes
+        # Decodes the next queued chunk while the current one plays
+        self._prefetch_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="AudioPrefetch")
 
     def play(self, audio_file: str, blocking: bool = True,
              on_start: Optional[Callable] = None,
              on_finish: Optional[Callable] = None) -> bool:
         """Play an audio file"""
         try:
-            if not Path(audio_file).exists():
-                print(f"❌ Audio file not found: {audio_file}")
+            name = self._lookup_file(audio_file)
+            if name is None:
+                _log(f"❌ Audio file not found: {audio_file}")
                 return False
 
             # Stop any current playback
@@ -75,70 +212,76 @@ class AudioPlayer:
             self.current_file = audio_file
             self.state = AudioState.PLAYING
             self.is_playing = True
+            gen = self._gen = next(self._gen_counter)
 
             if on_start:
                 on_start()
 
-            print(f"🔊 Playing: {Path(audio_file).name}")
+            _log(f"🔊 Playing: {name}")
 
             if blocking:
-                return self._play_blocking(on_finish)
+                return self._run_playback(gen, on_finish=on_finish)
             else:
-                self._playback_thread = threading.Thread(
-                    target=self._play_non_blocking,
-                    args=(on_finish,),
-                    daemon=True
-                )
-                self._playback_thread.start()
+                self._work_q.put((self._run_playback, (gen, 0, on_finish)))
                 return True
 
         except Exception as e:
-            print(f"❌ Error playing audio: {e}")
+            _log(f"❌ Error playing audio: {e}")
             self.state = AudioState.IDLE
             self.is_playing = False
             return False
 
-    def _play_blocking(self, on_finish: Optional[Callable] = None) -> bool:
-        """Play audio in blocking mode"""
+    def _lookup_file(self, audio_file: str) -> Optional[str]:
+        """Get the basename of audio_file, or None if it doesn't exist"""
+        name = self._path_cache.get(audio_file)
+        if name is None:
+            if not os.path.isfile(audio_file):
+                return None
+            # Temp TTS files never repeat - keep the cache from growing with them
+            if len(self._path_cache) >= 64:
+                self._path_cache.clear()
+            name = self._path_cache[audio_file] = os.path.basename(audio_file)
+        return name
+
+    def _run_playback(self, gen: int, loops: int = 0,
+                      on_finish: Optional[Callable] = None,
+                      sound: Optional[pygame.mixer.Sound] = None) -> bool:
+        """
+        Play self.current_file until it ends or stop() is requested
+
+        Args:
+            gen: Playback generation this run belongs to
+            loops: Extra repetitions, -1 loops until stopped
+            on_finish: Called when playback ends on its own
+            sound: Already decoded audio for self.current_file, if any
+        """
         try:
-            pygame.mixer.music.load(self.current_file)
-            pygame.mixer.music.play()
+            # Superseded before it got to start
+            if gen != self._gen:
+                return False
+
+            self._start_track(loops, sound)
 
             # Wait for playback to finish
-            while pygame.mixer.music.get_busy() and not self._stop_event.is_set():
-                time.sleep(0.1)
+            self._wait_for_playback(gen)
 
-            if on_finish and not self._stop_event.is_set():
+            if on_finish and gen == self._gen:
                 on_finish()
-
-            self.state = AudioState.IDLE
-            self.is_playing = False
             return True
 
         except Exception as e:
-            print(f"❌ Error in blocking playback: {e}")
-            self.state = AudioState.IDLE
-            self.is_playing = False
+            _log(f"❌ Error in playback: {e}")
             return False
 
-    def _play_non_blocking(self, on_finish: Optional[Callable] = None):
-        """Play audio in non-blocking mode"""
-        try:
-            pygame.mixer.music.load(self.current_file)
-            pygame.mixer.music.play()
-
-            # Wait for playback to finish
-            while pygame.mixer.music.get_busy() and not self._stop_event.is_set():
-                time.sleep(0.1)
-
-            if on_finish and not self._stop_event.is_set():
-                on_finish()
-
-        except Exception as e:
-            print(f"❌ Error in non-blocking playback: {e}")
         finally:
-            self.state = AudioState.IDLE
-            self.is_playing = False
+            # A newer play()/stop() owns the state now - leave it alone
+            if gen == self._gen:
+                self.state = AudioState.IDLE
+                self.is_playing = False
+                if loops:
+                    self.is_looping = False
+            self._schedule_mixer_shutdown()
+            self._schedule_keep_warm()
 
     def play_loop(self, audio_file: str, on_start: Optional[Callable] = None) -> bool:
         """
@@ -146,8 +289,9 @@ class AudioPlayer:
         Use stop_loop() to stop the looping playback
         """
         try:
-            if not Path(audio_file).exists():
-                print(f"❌ Audio file not found: {audio_file}")
+            name = self._lookup_file(audio_file)
+            if name is None:
+                _log(f"❌ Audio file not found: {audio_file}")
                 return False
 
             # Stop any current playback
@@ -157,79 +301,303 @@ class AudioPlayer:
             self.state = AudioState.PLAYING
             self.is_playing = True
             self.is_looping = True
+            gen = self._gen = next(self._gen_counter)
 
             if on_start:
                 on_start()
 
-            print(f"🔊 Playing (loop): {Path(audio_file).name}")
+            _log(f"🔊 Playing (loop): {name}")
 
-            # Start looping playback in background thread
-            self._playback_thread = threading.Thread(
-                target=self._play_loop_thread,
-                daemon=True
-            )
-            self._playback_thread.start()
+            # Loop clips are fixed filler tones - keep them decoded after first use
+            if audio_file not in self._preload_paths:
+                self.preload([audio_file])
+
+            # Start looping playback on the worker thread
+            self._work_q.put((self._run_playback, (gen, -1)))  # -1 = loop indefinitely
             return True
 
         except Exception as e:
-            print(f"❌ Error playing loop audio: {e}")
+            _log(f"❌ Error playing loop audio: {e}")
             self.state = AudioState.IDLE
             self.is_playing = False
             self.is_looping = False
             return False
 
-    def _play_loop_thread(self):
-        """Background thread for looping playback"""
+    def _ensure_mixer(self):
+        """Initialize pygame mixer if it isn't running yet"""
+        with self._mixer_lock:
+            self._mixer_epoch += 1
+            if self._mixer_ready:
+                return
+
+            # AUDIODEV is shared with the capture side (whisper_stt), so
+            # re-assert the playback device before SDL opens it
+            if self.output_device:
+                _set_audio_env(self.output_device)
+
+            # SDL_AUDIO_ALSA_SET_BUFFER_SIZE makes SDL honor the requested period
+            # size instead of picking its own
+            os.environ['SDL_AUDIO_ALSA_SET_BUFFER_SIZE'] = '1'
+            frequency = getattr(self.audio_config, 'mixer_frequency', 22050)
+            buffer = getattr(self.audio_config, 'mixer_buffer', 512)
+            try:
+                pygame.mixer.init(frequency=frequency, size=-16, channels=2,
+                                  buffer=buffer, allowedchanges=0)
+            except pygame.error as e:
+                # Some ALSA configurations refuse small periods
+                _log(f"⚠️ Mixer init with buffer={buffer} failed ({e}), retrying with 1024")
+                buffer = 1024
+                pygame.mixer.init(frequency=frequency, size=-16, channels=2,
+                                  buffer=buffer, allowedchanges=0)
+
+            # Any later bare pygame.mixer.init() (e.g. test_audio_system) reuses these settings
+            pygame.mixer.pre_init(frequency=frequency, size=-16, channels=2,
+                                  buffer=buffer, allowedchanges=0)
+
+            # Keep one channel per role out of Sound.play()'s automatic pick
+            pygame.mixer.set_reserved(2)
+            self._tts_channel = pygame.mixer.Channel(0)
+            self._loop_channel = pygame.mixer.Channel(1)
+
+            # 20 ms of silence in the mixer's own format, for prewarm()
+            frequency, size, channels = pygame.mixer.get_init()
+            self._silence = pygame.mixer.Sound(
+                buffer=bytes((frequency // 50) * channels * (abs(size) // 8))
+            )
+
+            self._mixer_ready = True
+
+            for path in self._preload_paths:
+                self._load_prompt(path)
+
+    def _schedule_mixer_shutdown(self):
+        """Shut the mixer down once playback has been idle for a while"""
+        timeout = getattr(self.audio_config, 'mixer_idle_timeout', 30.0)
+        if not timeout:
+            return
+
+        with self._mixer_lock:
+            self._idle_deadline = (time.monotonic() + timeout, self._mixer_epoch)
+            self._wake_idle_watch()
+
+    def _wake_idle_watch(self):
+        """Start the idle watch thread if needed and make it re-read its deadlines (hold _mixer_lock)"""
+        if self._idle_watch is None:
+            self._idle_watch = threading.Thread(
+                target=self._idle_watch_loop,
+                daemon=True,
+                name="AudioIdleWatch"
+            )
+            self._idle_watch.start()
+        self._idle_wake.set()
+
+    def _idle_watch_loop(self):
+        """Sleep until the next idle shutdown or keep-warm deadline and run it"""
+        while True:
+            self._idle_wake.clear()
+            now = time.monotonic()
+            with self._mixer_lock:
+                shutdown = self._idle_deadline
+                keep_warm = self._keep_warm_deadline
+                if shutdown and shutdown[0] <= now:
+                    self._idle_deadline = None
+                if keep_warm and keep_warm <= now:
+                    self._keep_warm_deadline = None
+
+            if shutdown and shutdown[0] <= now:
+                self._shutdown_mixer(shutdown[1])
+                continue
+            if keep_warm and keep_warm <= now:
+                self.prewarm()  # Schedules the next keep-warm itself
+                continue
+
+            pending = [deadline for deadline in (shutdown and shutdown[0], keep_warm) if deadline]
+            self._idle_wake.wait(min(pending) - now if pending else None)
+
+    def _shutdown_mixer(self, epoch: Optional[int] = None):
+        """Quit pygame mixer (runs on the idle watch thread - mixer.quit() is slow)"""
+        with self._mixer_lock:
+            if not self._mixer_ready:
+                return
+            # Mixer was used again since the shutdown was scheduled
+            if epoch is not None and epoch != self._mixer_epoch:
+                return
+
+            pygame.mixer.quit()
+            self._mixer_ready = False
+            # Cached Sounds belong to the mixer that decoded them
+            self._sfx.clear()
+
+    def prewarm(self):
+        """
+        Open the output device and push a short silent buffer through it,
+        so the next real playback doesn't pay for ALSA start-up
+        """
         try:
+            self._ensure_mixer()
+            self._silence.play()
+        except Exception as e:
+            _log(f"⚠️ Audio prewarm failed: {e}")
+
+        self._schedule_keep_warm()
+
+    def _schedule_keep_warm(self):
+        """Re-run prewarm() after AudioConfig.keep_warm_interval seconds"""
+        interval = getattr(self.audio_config, 'keep_warm_interval', 0.0)
+        if not interval:
+            return
+
+        with self._mixer_lock:
+            self._keep_warm_deadline = time.monotonic() + interval
+            self._wake_idle_watch()
+
+    def preload(self, audio_files):
+        """
+        Keep short prompt files (beeps, tones) decoded in memory
+
+        Args:
+            audio_files: Iterable of paths, decoded now if the mixer is open,
+                         otherwise the next time it is initialized
+        """
+        with self._mixer_lock:
+            for path in audio_files:
+                if path in self._preload_paths:
+                    continue
+                self._preload_paths.append(path)
+                if self._mixer_ready:
+                    self._load_prompt(path)
+
+    def _load_prompt(self, path: str):
+        """Decode a prompt file into self._sfx through a read-only memory map"""
+        try:
+            with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as mm:
+                # Sound() reads the whole file-like object up front, so the
+                # mapping can be released as soon as it returns
+                self._sfx[path] = pygame.mixer.Sound(file=mm)
+        except (OSError, ValueError, pygame.error) as e:
+            _log(f"⚠️ Could not preload {path}: {e}")
+
+    def _start_track(self, loops: int = 0, sound: Optional[pygame.mixer.Sound] = None):
+        """Start playing self.current_file (or an already decoded sound) on the appropriate output"""
+        self._ensure_mixer()
+        self._finished.clear()
+
+        if sound is None:
+            sound = self._sfx.get(self.current_file)
+        if sound is None:
+            if os.path.getsize(self.current_file) <= SOUND_CACHE_MAX_BYTES:
+                sound = pygame.mixer.Sound(self.current_file)
+
+        if sound is not None:
+            channel = self._loop_channel if loops else self._tts_channel
+            self._active_channel = channel
+            channel.play(sound, loops=loops)
+            self._track_end = None if loops else time.monotonic() + sound.get_length()
+        else:
+            self._active_channel = None
+            self._track_end = None
             pygame.mixer.music.load(self.current_file)
-            pygame.mixer.music.play(-1)  # -1 = loop indefinitely
+            pygame.mixer.music.play(loops)
 
-            # Wait until stop is requested
-            while self.is_looping and not self._stop_event.is_set():
-                time.sleep(0.1)
+    def _output(self):
+        """Get the object currently producing sound (a Channel or mixer.music)"""
+        return self._active_channel or pygame.mixer.music
 
+    def _halt_output(self):
+        """Stop both the music stream and the reserved channels"""
+        if self._mixer_ready:
             pygame.mixer.music.stop()
+            self._tts_channel.stop()
+            self._loop_channel.stop()
+
+    def _boost_priority(self):
+        """Raise the calling audio thread's priority unless disabled in config"""
+        if not getattr(self.audio_config, 'realtime_priority', True):
+            return
+        if not _boost_thread_priority():
+            _log(f"⚠️ Could not raise {threading.current_thread().name} priority (needs CAP_SYS_NICE)")
+
+    def _worker_loop(self):
+        """Run queued playback jobs one at a time"""
+        self._boost_priority()
+
+        while True:
+            target, args = self._work_q.get()
+            self._worker_idle.clear()
+            try:
+                target(*args)
+            except Exception as e:
+                _log(f"❌ Error in playback worker: {e}")
+            finally:
+                self._worker_idle.set()
+
+    def _wait_for_playback(self, gen: int):
+        """Block until the current track ends or generation gen is superseded"""
+        while gen == self._gen:
+            # Sleep until a decoded Sound should be done, then poll briefly.
+            # stop() and pause/resume ring _finished, so they don't wait for this
+            timeout = PLAYBACK_POLL_SECONDS
+            if self._track_end is not None:
+                timeout = max(timeout, self._track_end - time.monotonic())
+            self._finished.wait(timeout)
+            self._finished.clear()
+            self._drain_commands()
+            if self.state != AudioState.PAUSED and not self._output().get_busy():
+                break
+
+    def _post_command(self, command: str):
+        """Hand a command to the thread waiting on playback"""
+        self._cmd_q.append(command)
+        self._finished.set()
+
+    def _drain_commands(self):
+        """Apply queued commands (called from the playback thread only)"""
+        while self._cmd_q:
+            command = self._cmd_q.popleft()
+            if command == "pause" and self.state == AudioState.PLAYING:
+                self._output().pause()
+                self.state = AudioState.PAUSED
+                _log("⏸️ Audio paused")
+            elif command == "resume" and self.state == AudioState.PAUSED:
+                self._output().unpause()
+                self.state = AudioState.PLAYING
+                _log("▶️ Audio resumed")
+
+    def _stop_common(self, message: str):
+        """Halt output, wake and join the playback thread, and reset state"""
+        self._gen = next(self._gen_counter)
+        self.is_looping = False
+        self._cmd_q.clear()
+        self._halt_output()
+        self._finished.set()
+
+        # Drop jobs that haven't started yet
+        while True:
+            try:
+                self._work_q.get_nowait()
+            except queue.Empty:
+                break
 
-        except Exception as e:
-            print(f"❌ Error in loop playback: {e}")
-        finally:
-            self.state = AudioState.IDLE
-            self.is_playing = False
-            self.is_looping = False
+        # Wait for the worker to finish its job (but not if we're in that thread).
+        # _finished wakes it immediately, so the timeout is only a safety margin
+        if threading.current_thread() != self._playback_thread:
+            self._worker_idle.wait(timeout=0.1)
+
+        self.state = AudioState.IDLE
+        self.is_playing = False
+        _log(message)
 
     def stop_loop(self):
         """Stop looping playback"""
         if self.is_looping:
-            self.is_looping = False
-            self._stop_event.set()
-            pygame.mixer.music.stop()
-
-            # Wait for playback thread to finish (but not if we're in that thread)
-            if self._playback_thread and self._playback_thread.is_alive():
-                if threading.current_thread() != self._playback_thread:
-                    self._playback_thread.join(timeout=1.0)
-
-            self.state = AudioState.IDLE
-            self.is_playing = False
-            self._stop_event.clear()
-            print("🛑 Loop playback stopped")
+            self._stop_common("🛑 Loop playback stopped")
 
     def stop(self):
         """Stop current playback"""
-        if self.is_playing or self.is_looping:
-            self.is_looping = False
-            self._stop_event.set()
-            pygame.mixer.music.stop()
-
-            # Wait for playback thread to finish (but not if we're in that thread)
-            if self._playback_thread and self._playback_thread.is_alive():
-                if threading.current_thread() != self._playback_thread:
-                    self._playback_thread.join(timeout=1.0)
-
-            self.state = AudioState.IDLE
-            self.is_playing = False
-            self._stop_event.clear()
-            print("🛑 Audio playback stopped")
+        # Fast path - play()/play_loop() call this before every clip, usually while idle
+        if self.state == AudioState.IDLE and not (self.is_playing or self.is_looping):
+            return
+        self._stop_common("🛑 Audio playback stopped")
 
     # Queue-based playback methods (NEW for streaming)
 
@@ -241,19 +609,14 @@ class AudioPlayer:
             audio_file: Path to the audio file
             metadata: Optional metadata dict (e.g., {"text": "...", "cleanup": True})
         """
-        if metadata is None:
-            metadata = {}
-
-        self.playback_queue.put({
-            "file": audio_file,
-            "metadata": metadata
-        })
+        self.playback_queue.append(AudioCommand(audio_file, metadata or {}))
         self.enqueued_count += 1
+        self._queue_event.set()
 
     def start_queue_playback(self):
         """Start background thread to process queue"""
         # Always reset counters and flags for new session (even if queue already active)
-        self.generation_complete = False
+        self.generation_complete.clear()
         self.enqueued_count = 0
         self.played_count = 0
 
@@ -265,9 +628,9 @@ class AudioPlayer:
                 name="AudioQueueProcessor"
             )
             self.queue_thread.start()
-            print("🎵 Audio queue playback started")
+            _log("🎵 Audio queue playback started")
         else:
-            print("ℹ️  Queue already active, counters reset for new session")
+            _log("ℹ️  Queue already active, counters reset for new session")
 
     def stop_queue_playback(self, clear_queue: bool = True):
         """
@@ -281,27 +644,24 @@ class AudioPlayer:
 
             # Clear queue if requested
             if clear_queue:
-                while not self.playback_queue.empty():
+                while self.playback_queue:
                     try:
-                        item = self.playback_queue.get_nowait()
-                        # Cleanup temp file if needed
-                        if item["metadata"].get("cleanup", False):
-                            try:
-                                Path(item["file"]).unlink(missing_ok=True)
-                            except Exception as e:
-                                print(f"❌ Error cleaning up queued file: {e}")
-                    except queue.Empty:
+                        item = self.playback_queue.popleft()
+                    except IndexError:
                         break
+                    # Cleanup temp file if needed
+                    self._remove_chunk_file(item)
 
-            # Stop current playback
+            # Stop current playback and wake the processor so it can exit
             self.stop()
+            self._queue_event.set()
 
             # Wait for queue thread to finish
             if self.queue_thread and self.queue_thread.is_alive():
                 if threading.current_thread() != self.queue_thread:
                     self.queue_thread.join(timeout=2.0)
 
-            print("🛑 Audio queue playback stopped")
+            _log("🛑 Audio queue playback stopped")
 
     def signal_generation_complete(self):
         """
@@ -309,104 +669,171 @@ class AudioPlayer:
         This allows the queue processor to trigger on_queue_complete callback
         once all queued audio has finished playing.
         """
-        self.generation_complete = True
+        self.generation_complete.set()
+        self._queue_event.set()
 
     def _queue_processor_thread(self):
         """Background worker that plays files sequentially from queue"""
+        self._boost_priority()
+        prefetched = None  # (item, future) taken early to decode during playback
         try:
             while self.is_queue_active:
-                try:
-                    # Get next item from queue (with timeout to check is_queue_active)
-                    item = self.playback_queue.get(timeout=0.5)
+                if prefetched:
+                    item, future = prefetched
+                    prefetched = None
+                else:
+                    try:
+                        item = self.playback_queue.popleft()
+                    except IndexError:
+                        # No items in queue - generation may have completed after the last chunk
+                        if self.is_queue_active:
+                            self._check_queue_complete()
+
+                        # Sleep until something is enqueued, generation completes or we're stopped
+                        self._queue_event.wait()
+                        self._queue_event.clear()
+                        continue
+                    future = None
 
-                    audio_file = item["file"]
-                    metadata = item["metadata"]
+                audio_file = item.file
+                metadata = item.metadata
 
-                    if not Path(audio_file).exists():
-                        print(f"❌ Queued audio file not found: {audio_file}")
-                        continue
+                try:
+                    # Chunks are decoded from RAM (and their temp file removed)
+                    # before they play - by the prefetch thread when possible
+                    self._ensure_mixer()
+                    sound = self._prefetched_sound(future)
+                    if sound is None:
+                        try:
+                            sound = self._load_chunk(item)
+                        except FileNotFoundError:
+                            _log(f"❌ Queued audio file not found: {audio_file}")
+                            continue
 
                     # Call on_chunk_start callback if provided
                     if self.on_chunk_start:
                         try:
                             self.on_chunk_start(metadata)
                         except Exception as e:
-                            print(f"❌ Error in on_chunk_start callback: {e}")
+                            _log(f"❌ Error in on_chunk_start callback: {e}")
 
-                    # Play audio using blocking mode to avoid gaps
-                    self.current_file = audio_file
-                    self.state = AudioState.PLAYING
-                    self.is_playing = True
+                    # Start decoding the next chunk so it's ready the moment this one ends
+                    prefetched = self._prefetch_next()
 
-                    # Use _play_blocking to play sequentially
-                    self._play_blocking(on_finish=None)
+                    # Play inline on this thread to keep chunks sequential
+                    self._play_chunk(audio_file, sound)
 
-                    # Increment played counter
-                    self.played_count += 1
+                except Exception as e:
+                    _log(f"❌ Error processing queue item: {e}")
+                    self._remove_chunk_file(item)
 
-                    # Cleanup temp file if requested
-                    if metadata.get("cleanup", False):
-                        try:
-                            Path(audio_file).unlink(missing_ok=True)
-                        except Exception as e:
-                            print(f"❌ Error cleaning up audio file: {e}")
-
-                except queue.Empty:
-                    # No items in queue, check if we should call on_queue_complete
-                    # Only trigger callback when ALL conditions are met:
-                    # 1. Generation is complete (no more items will be enqueued)
-                    # 2. All enqueued items have been played
-                    # 3. Queue is empty (final verification)
-                    if (self.is_queue_active and
-                        self.generation_complete and
-                        self.played_count >= self.enqueued_count and
-                        self.playback_queue.empty()):
-
-                        # Give a brief grace period for final verification
-                        time.sleep(0.2)
-                        # Double-check conditions after grace period
-                        if (self.played_count >= self.enqueued_count and
-                            self.playback_queue.empty() and
-                            self.on_queue_complete):
-                            try:
-                                print(f"🎵 Queue complete: played {self.played_count}/{self.enqueued_count} items")
-                                self.on_queue_complete()
-                            except Exception as e:
-                                print(f"❌ Error in on_queue_complete callback: {e}")
-                            # Reset callback to avoid multiple calls
-                            self.on_queue_complete = None
-                    continue
+                finally:
+                    # Skipped and failed chunks count too, otherwise
+                    # on_queue_complete would never fire for this response
+                    self.played_count += 1
 
-                except Exception as e:
-                    print(f"❌ Error processing queue item: {e}")
+                    # The last chunk may have just finished
+                    self._check_queue_complete()
 
         finally:
+            # A chunk taken for prefetch won't be played any more
+            if prefetched:
+                item, future = prefetched
+                future.cancel()
+                self._remove_chunk_file(item)
+
             self.is_queue_active = False
             self.state = AudioState.IDLE
             self.is_playing = False
-            print("✅ Queue processor thread exited")
+            _log("✅ Queue processor thread exited")
+
+    def _check_queue_complete(self):
+        """
+        Call on_queue_complete once, when ALL conditions are met:
+        1. Generation is complete (no more items will be enqueued)
+        2. All enqueued items have been played
+        3. Queue is empty
+        """
+        if (self.generation_complete.is_set() and
+            self.played_count >= self.enqueued_count and
+            not self.playback_queue and
+            self.on_queue_complete):
+            callback = self.on_queue_complete
+            # Reset callback to avoid multiple calls
+            self.on_queue_complete = None
+            try:
+                _log(f"🎵 Queue complete: played {self.played_count}/{self.enqueued_count} items")
+                callback()
+            except Exception as e:
+                _log(f"❌ Error in on_queue_complete callback: {e}")
+
+    def _play_chunk(self, audio_file: str, sound: Optional[pygame.mixer.Sound] = None) -> bool:
+        """Play one queued chunk on this thread (no stop-current-playback step like play())"""
+        self.current_file = audio_file
+        self.state = AudioState.PLAYING
+        self.is_playing = True
+        gen = self._gen = next(self._gen_counter)
+        return self._run_playback(gen, sound=sound)
+
+    def _prefetch_next(self):
+        """Take the next queued item (if any) and decode it on the prefetch thread"""
+        try:
+            item = self.playback_queue.popleft()
+        except IndexError:
+            return None
+        return item, self._prefetch_pool.submit(self._load_chunk, item)
+
+    def _load_chunk(self, item: AudioCommand) -> pygame.mixer.Sound:
+        """Read a queued chunk into memory and decode it, then delete it if requested"""
+        with open(item.file, 'rb') as f:
+            data = f.read()
+
+        # file= (not buffer=) so the WAV header is parsed rather than played
+        sound = pygame.mixer.Sound(file=io.BytesIO(data))
+
+        # Decoded into RAM now - the temp file isn't needed for playback.
+        # A failed decode keeps it so the direct reload can retry
+        self._remove_chunk_file(item)
+        return sound
+
+    def _remove_chunk_file(self, item: AudioCommand):
+        """Delete a queued chunk's temp file if its metadata asks for cleanup"""
+        if not item.metadata.get("cleanup", False):
+            return
+        try:
+            os.unlink(item.file)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            _log(f"❌ Error cleaning up queued file: {e}")
+
+    def _prefetched_sound(self, future) -> Optional[pygame.mixer.Sound]:
+        """Get a prefetched Sound, or None to let playback load the file itself"""
+        if future is None:
+            return None
+        try:
+            return future.result()
+        except Exception as e:
+            _log(f"⚠️ Prefetch failed, loading directly: {e}")
+            return None
 
     def is_queue_empty(self) -> bool:
         """Check if playback queue is empty"""
-        return self.playback_queue.empty()
+        return not self.playback_queue
 
     def get_queue_size(self) -> int:
         """Get number of items in playback queue"""
-        return self.playback_queue.qsize()
+        return len(self.playback_queue)
 
     def pause(self):
         """Pause current playback"""
         if self.state == AudioState.PLAYING:
-            pygame.mixer.music.pause()
-            self.state = AudioState.PAUSED
-            print("⏸️ Audio paused")
+            self._post_command("pause")
 
     def resume(self):
         """Resume paused playback"""
         if self.state == AudioState.PAUSED:
-            pygame.mixer.music.unpause()
-            self.state = AudioState.PLAYING
-            print("▶️ Audio resumed")
+            self._post_command("resume")
 
     def get_state(self) -> AudioState:
         """Get current audio state"""
@@ -414,135 +841,175 @@ class AudioPlayer:
 
     def is_busy(self) -> bool:
         """Check if audio is currently playing"""
-        return self.is_playing or pygame.mixer.music.get_busy()
+        return self.state != AudioState.IDLE
 
     def cleanup(self):
         """Clean up audio resources"""
         self.stop()
-        pygame.mixer.quit()
+        with self._mixer_lock:
+            self._idle_deadline = None
+            self._keep_warm_deadline = None
+            self._idle_wake.set()
+        self._prefetch_pool.shutdown(wait=False)
+        self._shutdown_mixer()
 
 class StateManager:
     """Manages the overall state of the chatbot system"""
 
     def __init__(self):
+        # Readers never take the lock: current_state is only ever rebound,
+        # and each per-state callback list is an immutable tuple that
+        # writers replace wholesale, so a snapshot is always consistent
         self.current_state = "idle"
         self.state_callbacks = {}
-        self._lock = threading.Lock()
+        self._lock = threading.Lock()  # Serializes writers only
 
     def set_state(self, new_state: str, data: dict = None):
         """Set the current state and trigger callbacks"""
         with self._lock:
             old_state = self.current_state
             self.current_state = new_state
+            callbacks = self.state_callbacks.get(new_state, ())
 
-            print(f"🔄 State: {old_state} → {new_state}")
+            _log(f"🔄 State: {old_state} → {new_state}")
 
-            # Trigger callbacks for the new state
-            if new_state in self.state_callbacks:
-                for callback in self.state_callbacks[new_state]:
-                    try:
-                        callback(old_state, new_state, data or {})
-                    except Exception as e:
-                        print(f"❌ Error in state callback: {e}")
+        # Trigger callbacks for the new state
+        for callback in callbacks:
+            try:
+                callback(old_state, new_state, data or {})
+            except Exception as e:
+                _log(f"❌ Error in state callback: {e}")
 
     def get_state(self) -> str:
         """Get the current state"""
-        with self._lock:
-            return self.current_state
+        return self.current_state
 
     def is_state(self, state: str) -> bool:
         """Check if currently in a specific state"""
-        return self.get_state() == state
+        return self.current_state == state
 
     def register_callback(self, state: str, callback: Callable):
         """Register a callback for a specific state"""
-        if state not in self.state_callbacks:
-            self.state_callbacks[state] = []
-        self.state_callbacks[state].append(callback)
+        with self._lock:
+            self.state_callbacks[state] = self.state_callbacks.get(state, ()) + (callback,)
 
     def unregister_callback(self, state: str, callback: Callable):
         """Unregister a callback for a specific state"""
-        if state in self.state_callbacks:
-            try:
-                self.state_callbacks[state].remove(callback)
-            except ValueError:
-                pass
+        with self._lock:
+            callbacks = self.state_callbacks.get(state, ())
+            if callback in callbacks:
+                index = callbacks.index(callback)
+                self.state_callbacks[state] = callbacks[:index] + callbacks[index + 1:]
 
 class SilenceDetector:
     """Detects when user has stopped speaking"""
 
     def __init__(self, threshold: float = 2.0):
         self.threshold = threshold
-        self.last_activity_time = 0
+        self._threshold_ns = int(threshold * 1e9)
+        self._last_activity_ns = 0  # time.monotonic_ns() of last activity, 0 = none pending
         self.is_monitoring = False
         self._monitor_thread = None
-        self._stop_event = threading.Event()
+        self._cond = threading.Condition()
         self.callbacks = []
 
     def start_monitoring(self):
         """Start monitoring for silence"""
         if not self.is_monitoring:
             self.is_monitoring = True
-            self._stop_event.clear()
             self._monitor_thread = threading.Thread(target=self._monitor_silence, daemon=True)
             self._monitor_thread.start()
-            print("👂 Silence detector started")
+            _log("👂 Silence detector started")
 
     def stop_monitoring(self):
         """Stop monitoring for silence"""
         if self.is_monitoring:
-            self.is_monitoring = False
-            self._stop_event.set()
+            with self._cond:
+                self.is_monitoring = False
+                self._cond.notify()
             if self._monitor_thread:
                 self._monitor_thread.join(timeout=1.0)
-            print("🛑 Silence detector stopped")
+            _log("🛑 Silence detector stopped")
 
     def update_activity(self):
         """Update the last activity time"""
-        self.last_activity_time = time.time()
+        with self._cond:
+            self._last_activity_ns = time.monotonic_ns()
+            self._cond.notify()
 
     def get_silence_duration(self) -> float:
         """Get current silence duration"""
-        if self.last_activity_time == 0:
+        last_activity_ns = self._last_activity_ns
+        if last_activity_ns == 0:
             return 0
-        return time.time() - self.last_activity_time
+        return (time.monotonic_ns() - last_activity_ns) / 1e9
 
     def register_callback(self, callback: Callable[[float], None]):
         """Register a callback to be called when silence threshold is reached"""
         self.callbacks.append(callback)
 
-    def _monitor_silence(self):
-        """Monitor for silence threshold"""
-        while self.is_monitoring and not self._stop_event.is_set():
-            time.sleep(0.5)
+    def _wait_for_silence(self) -> Optional[float]:
+        """
+        Sleep until the silence deadline passes (caller holds self._cond)
 
-            if self.last_activity_time > 0:
-                silence_duration = self.get_silence_duration()
+        Returns:
+            Silence duration, or None if monitoring was stopped
+        """
+        while self.is_monitoring:
+            if self._last_activity_ns == 0:
+                # Nothing to time until the next activity update
+                self._cond.wait()
+                continue
 
-                if silence_duration >= self.threshold:
-                    # Trigger callbacks
-                    for callback in self.callbacks:
-                        try:
-                            callback(silence_duration)
-                        except Exception as e:
-                            print(f"❌ Error in silence callback: {e}")
+            silence_ns = time.monotonic_ns() - self._last_activity_ns
+            if silence_ns < self._threshold_ns:
+                self._cond.wait(timeout=(self._threshold_ns - silence_ns) / 1e9)
+                continue
+
+            # Reset activity time to avoid repeated triggers
+            self._last_activity_ns = 0
+            return silence_ns / 1e9
+
+        return None
+
+    def _monitor_silence(self):
+        """Monitor for silence threshold"""
+        while True:
+            with self._cond:
+                silence_duration = self._wait_for_silence()
+            if silence_duration is None:
+                return
+
+            # Trigger callbacks
+            for callback in self.callbacks:
+                try:
+                    callback(silence_duration)
+                except Exception as e:
+                    _log(f"❌ Error in silence callback: {e}")
 
-                    # Reset activity time to avoid repeated triggers
-                    self.last_activity_time = 0
+TTS_TEMP_PATTERN = "tts_response_*.wav"
+_TTS_TEMP_RE = re.compile(fnmatch.translate(TTS_TEMP_PATTERN))
 
-def cleanup_temp_files(directory: str = "/tmp", pattern: str = "tts_response_*.wav"):
+def cleanup_temp_files(directory: str = "/tmp", pattern: str = TTS_TEMP_PATTERN):
     """Clean up temporary audio files"""
     try:
-        import glob
-        files = glob.glob(f"{directory}/{pattern}")
         cleaned = 0
+        if pattern == TTS_TEMP_PATTERN:
+            matcher = _TTS_TEMP_RE
+        else:
+            matcher = re.compile(fnmatch.translate(pattern))
 
-        for file_path in files:
-            try:
-                Path(file_path).unlink()
-                cleaned += 1
-            except Exception as e:
-                print(f"❌ Error cleaning {file_path}: {e}")
+        # scandir yields names and types straight from the directory
+        # listing, so non-matching entries cost no extra stat() call
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if not matcher.match(entry.name) or not entry.is_file(follow_symlinks=False):
+                    continue
+                try:
+                    os.unlink(entry.path)
+                    cleaned += 1
+                except OSError as e:
+                    print(f"❌ Error cleaning {entry.path}: {e}")
 
         if cleaned > 0:
             print(f"🧹 Cleaned up {cleaned} temporary audio files")
@@ -550,35 +1017,41 @@ def cleanup_temp_files(directory: str = "/tmp", pattern: str = "tts_response_*.w
     except Exception as e:
         print(f"❌ Error during cleanup: {e}")
 
+@lru_cache(maxsize=4)
+def _test_tone(sample_rate: int, duration: float = 0.5, frequency: int = 440):
+    """Generate a stereo int16 sine tone (cached - regenerated only for a new rate)"""
+    import numpy as np
+
+    # Single float32 pass, scaled in place
+    n_samples = int(sample_rate * duration)
+    phase = (2 * np.pi * frequency / sample_rate) * np.arange(n_samples, dtype=np.float32)
+    wave = np.sin(phase, dtype=np.float32)
+    np.multiply(wave, 32767.0, out=wave)
+
+    # Duplicate mono into both channels in one copy
+    sound_array = wave.astype(np.int16)
+    return np.broadcast_to(sound_array[:, None], (n_samples, 2)).copy(order='C')
+
 def test_audio_system() -> bool:
     """Test if the audio system is working"""
     try:
-        # Test pygame mixer initialization
-        pygame.mixer.init()
-
-        # Create a simple test tone
-        import numpy as np
+        # Test pygame mixer initialization - reuse the mixer if an
+        # AudioPlayer already has it open, and leave it running in that case
+        owned = not pygame.mixer.get_init()
+        if owned:
+            pygame.mixer.init()
 
-        # Generate a simple test tone
-        sample_rate = 22050
+        # Generate a simple test tone (A4) at the mixer's actual rate
         duration = 0.5
-        frequency = 440  # A4 note
-
-        t = np.linspace(0, duration, int(sample_rate * duration), False)
-        wave = np.sin(2 * np.pi * frequency * t)
-
-        # Convert to pygame sound
-        sound_array = (wave * 32767).astype(np.int16)
-        stereo_array = np.zeros((len(sound_array), 2), dtype=np.int16)
-        stereo_array[:, 0] = sound_array
-        stereo_array[:, 1] = sound_array
+        sample_rate = pygame.mixer.get_init()[0]
 
-        sound = pygame.sndarray.make_sound(stereo_array)
+        sound = pygame.sndarray.make_sound(_test_tone(sample_rate, duration))
         sound.play()
 
         time.sleep(duration + 0.1)  # Wait for sound to finish
 
-        pygame.mixer.quit()
+        if owned:
+            pygame.mixer.quit()
         print("✅ Audio system test passed")
         return True
 
@@ -6,14 +6,26 @@ IMPORTANT: This config is specifically tuned for Raspberry Pi 5 with:
 - HifiBerry DAC output (hw:CARD=sndrpihifiberry,DEV=0)
 - Paths in /root/ directory
 - gemma3-ptbr model for Portuguese
+
+Import this module before pygame: it sets SDL's audio driver defaults
+from the environment section below.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import Optional
 import os
+import time
+
+# HifiBerry DAC output
+DEFAULT_PLAYBACK_DEVICE = "hw:CARD=sndrpihifiberry,DEV=0"
+
+# SDL reads these when its audio subsystem starts, so set them before any
+# pygame code runs. setdefault keeps values exported by the user
+os.environ.setdefault('SDL_AUDIODRIVER', 'alsa')
+os.environ.setdefault('AUDIODEV', DEFAULT_PLAYBACK_DEVICE)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WhisperConfig:
     # Model and binary paths - Uses home directory for portability
     model_path: str = os.path.expanduser("~/whisper.cpp/models/ggml-base.bin")  # Multilingual (PT-BR support)
@@ -43,7 +55,7 @@ class WhisperConfig:
     min_audio_length: float = 0.5  # Minimum seconds of audio to process
     debug_mode: bool = True  # Enable debug output (RMS levels, etc.)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class OllamaConfig:
     url: str = "http://localhost:11434/api/chat"  # Using /chat endpoint for proper message handling
     model: str = "gemma3-ptbr"  # Default: gemma3 with forced Portuguese (fastest for RPi5)
@@ -70,14 +82,14 @@ class OllamaConfig:
     #   model: str = "gemma3-ptbr"      # Use Gemma3 with forced Portuguese (RECOMMENDED)
     #   model: str = "llama3.2:1b"      # Use Llama3.2 (best quality)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PiperConfig:
     binary: str = os.path.expanduser("~/piper/piper/piper")
     model: str = "pt_BR-faber-medium.onnx"  # Brazilian Portuguese TTS model
     model_path: str = os.path.expanduser("~/piper/piper/")
     temp_dir: str = "/tmp"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AudioConfig:
     silence_threshold: float = 1.0  # seconds
     sample_rate: int = 16000
@@ -85,9 +97,19 @@ class AudioConfig:
 
     # ALSA output device configuration - STABLE across reboots
     # HifiBerry DAC output (card 2, device 0)
-    playback_device_name: str = "hw:CARD=sndrpihifiberry,DEV=0"  # HifiBerry DAC
-
-@dataclass
+    playback_device_name: str = DEFAULT_PLAYBACK_DEVICE  # HifiBerry DAC
+
+    # pygame mixer settings for playback
+    # 22050 Hz matches Piper's output, so TTS audio needs no resampling in SDL
+    mixer_frequency: int = 22050
+    mixer_buffer: int = 512  # Frames per period (~23 ms) - falls back to 1024 if ALSA refuses it
+    mixer_idle_timeout: float = 30.0  # Seconds idle before closing the mixer (0 = keep open)
+    preload_prompts: tuple = ()  # Short WAV prompts decoded once whenever the mixer opens
+    realtime_priority: bool = True  # SCHED_FIFO/nice boost for playback threads (needs CAP_SYS_NICE)
+    keep_warm_interval: float = 0.0  # Play 20 ms of silence every N seconds while idle so the
+                                     # DAC stays open (keeps the mixer from idling out), 0 = off
+
+@dataclass(frozen=True, slots=True)
 class ConversationConfig:
     max_history: int = 10  # Keep last 10 exchanges
     system_prompt: str = ""  # Empty for better results with small models
@@ -105,7 +127,7 @@ class ConversationConfig:
     use_streaming: bool = True  # Enable streaming LLM + incremental TTS (default: enabled)
     min_sentence_length: int = 30  # Minimum characters for sentence detection (balanced)
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class GPIOConfig:
     """GPIO pin configuration for LED feedback"""
     enabled: bool = True  # Enable/disable LED feedback
@@ -119,6 +141,8 @@ class GPIOConfig:
 class ChatbotConfig:
     """Main configuration class for the voice chatbot - RPI5 Edition"""
 
+    VALIDATE_CACHE_TTL = 5.0  # seconds a validate() result is reused
+
     def __init__(self):
         self.whisper = WhisperConfig()
         self.ollama = OllamaConfig()
@@ -127,30 +151,38 @@ class ChatbotConfig:
         self.conversation = ConversationConfig()
         self.gpio = GPIOConfig()
 
+        # Last validate() result, keyed on the (frozen) sections it checked
+        self._validated_key = None
+        self._validated_at = 0.0
+        self._validate_errors = []
+
+    def _required_paths(self):
+        """(path, error prefix) for every file/directory validate() checks"""
+        return [
+            (self.whisper.model_path, "Whisper model"),
+            (self.whisper.cli_binary, "Whisper CLI binary"),
+            (self.piper.binary, "Piper binary"),
+            (str(Path(self.piper.model_path) / self.piper.model), "Piper model"),
+            (self.piper.temp_dir, "Temp directory"),
+        ]
+
     def validate(self):
         """Validate that all required files and services exist"""
-        errors = []
-
-        # Check whisper files
-        if not Path(self.whisper.model_path).exists():
-            errors.append(f"Whisper model not found: {self.whisper.model_path}")
-
-        if not Path(self.whisper.cli_binary).exists():
-            errors.append(f"Whisper CLI binary not found: {self.whisper.cli_binary}")
-
-        # Check piper files
-        if not Path(self.piper.binary).exists():
-            errors.append(f"Piper binary not found: {self.piper.binary}")
-
-        piper_model_full_path = Path(self.piper.model_path) / self.piper.model
-        if not piper_model_full_path.exists():
-            errors.append(f"Piper model not found: {piper_model_full_path}")
-
-        # Check temp directory
-        if not Path(self.piper.temp_dir).exists():
-            errors.append(f"Temp directory not found: {self.piper.temp_dir}")
-
-        return errors
+        # Repeated checks (e.g. health probes) reuse the last result for a few
+        # seconds instead of stat()ing every path again
+        key = (self.whisper, self.piper)
+        now = time.monotonic()
+        if key == self._validated_key and now - self._validated_at < self.VALIDATE_CACHE_TTL:
+            return list(self._validate_errors)
+
+        errors = [f"{label} not found: {path}"
+                  for path, label in self._required_paths()
+                  if not os.path.exists(path)]
+
+        self._validated_key = key
+        self._validated_at = now
+        self._validate_errors = errors
+        return list(errors)
 
     @classmethod
     def from_env(cls):
@@ -158,22 +190,23 @@ class ChatbotConfig:
         config = cls()
 
         # Override with environment variables if they exist
+        # (config sections are frozen, so rebuild them instead of mutating)
         if os.getenv("WHISPER_MODEL_PATH"):
-            config.whisper.model_path = os.getenv("WHISPER_MODEL_PATH")
+            config.whisper = replace(config.whisper, model_path=os.getenv("WHISPER_MODEL_PATH"))
 
         if os.getenv("WHISPER_CLI_BINARY"):
-            config.whisper.cli_binary = os.getenv("WHISPER_CLI_BINARY")
+            config.whisper = replace(config.whisper, cli_binary=os.getenv("WHISPER_CLI_BINARY"))
 
         if os.getenv("OLLAMA_URL"):
-            config.ollama.url = os.getenv("OLLAMA_URL")
+            config.ollama = replace(config.ollama, url=os.getenv("OLLAMA_URL"))
 
         if os.getenv("OLLAMA_MODEL"):
-            config.ollama.model = os.getenv("OLLAMA_MODEL")
+            config.ollama = replace(config.ollama, model=os.getenv("OLLAMA_MODEL"))
 
         if os.getenv("PIPER_BINARY"):
-            config.piper.binary = os.getenv("PIPER_BINARY")
+            config.piper = replace(config.piper, binary=os.getenv("PIPER_BINARY"))
 
         if os.getenv("PIPER_MODEL_PATH"):
-            config.piper.model_path = os.getenv("PIPER_MODEL_PATH")
+            config.piper = replace(config.piper, model_path=os.getenv("PIPER_MODEL_PATH"))
 
         return config
@@ -2,20 +2,65 @@
 Conversation management for the voice chatbot
 """
 
+import bisect
+import io
 import json
+import mmap
+import os
+import queue
+import threading
 import time
+from collections import Counter, deque
+from itertools import groupby, islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import Deque, List, Dict, Any, Optional
 from datetime import datetime, timedelta
 
+# orjson is optional - it serializes several times faster than the stdlib json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def _dumps(data: Any) -> bytes:
+    """Serialize data as indented UTF-8 JSON"""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2, ensure_ascii=False).encode('utf-8')
+
+def _dumps_line(data: Any) -> bytes:
+    """Serialize data as one compact line of UTF-8 JSON (no trailing newline)"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+def _loads(raw: bytes) -> Any:
+    """Parse UTF-8 JSON bytes"""
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+# Markdown export headings per role (anything but "user" is shown as the assistant)
+ROLE_MARKDOWN = {"user": "🗣️ **User**", "assistant": "🤖 **Assistant**"}
+
 class ConversationEntry:
     """Represents a single conversation entry"""
 
+    __slots__ = ('role', 'content', 'timestamp', 'metadata', '_content_lower')
+
     def __init__(self, role: str, content: str, timestamp: Optional[float] = None):
         self.role = role  # 'user' or 'assistant'
         self.content = content
         self.timestamp = timestamp or time.time()
-        self.metadata = {}
+        self.metadata: Optional[Dict[str, Any]] = None  # Rarely used - created on first write
+        self._content_lower: Optional[str] = None  # Built on first case-insensitive search
+
+    @property
+    def content_lower(self) -> str:
+        """Lowercased content, computed once (entries aren't edited after creation)"""
+        if self._content_lower is None:
+            self._content_lower = self.content.lower()
+        return self._content_lower
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
@@ -23,14 +68,14 @@ class ConversationEntry:
             "role": self.role,
             "content": self.content,
             "timestamp": self.timestamp,
-            "metadata": self.metadata
+            "metadata": self.metadata or {}
         }
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ConversationEntry":
         """Create from dictionary"""
         entry = cls(data["role"], data["content"], data.get("timestamp"))
-        entry.metadata = data.get("metadata", {})
+        entry.metadata = data.get("metadata") or None
         return entry
 
     def get_datetime(self) -> datetime:
@@ -47,31 +92,98 @@ class ConversationManager:
     def __init__(self, max_entries: int = 50, save_file: Optional[str] = None):
         self.max_entries = max_entries
         self.save_file = save_file
-        self.entries: List[ConversationEntry] = []
+        # Bounded deque: appending past max_entries drops the oldest entry in O(1)
+        self.entries: Deque[ConversationEntry] = deque(maxlen=max_entries)
+        self._role_counts = Counter()  # role -> entries in self.entries, kept by every mutation
         self.session_id = str(int(time.time()))
 
+        # New entries are appended to a JSONL journal next to the save file;
+        # the full JSON snapshot is only rewritten by save_conversation()
+        self.journal_file = f"{save_file}.jsonl" if save_file else None
+        self._journal_fd = None  # Opened (O_APPEND) on first append
+        self._journal_count = 0  # Entries in the journal since the last snapshot
+        # Appends are written and synced in batches by a background thread
+        self._write_q = queue.Queue()
+        self._journal_lock = threading.Lock()  # Serializes batch writes with truncation
+        self._writer_thread = None
+
         # Load existing conversation if save file exists
-        if save_file and Path(save_file).exists():
+        if save_file and (Path(save_file).exists() or Path(self.journal_file).exists()):
             self.load_conversation()
 
     def add_entry(self, role: str, content: str, metadata: Optional[Dict] = None) -> ConversationEntry:
         """Add a new conversation entry"""
         entry = ConversationEntry(role, content)
         if metadata:
-            entry.metadata.update(metadata)
+            entry.metadata = dict(metadata)
 
-        self.entries.append(entry)
+        # The deque evicts the oldest entry once full
+        if self.entries and len(self.entries) == self.max_entries:
+            self._role_counts[self.entries[0].role] -= 1
 
-        # Trim if too many entries
-        if len(self.entries) > self.max_entries:
-            self.entries = self.entries[-self.max_entries:]
+        self.entries.append(entry)
+        # With max_entries=0 the deque keeps nothing - only count stored entries
+        if self.max_entries:
+            self._role_counts[role] += 1
 
         # Auto-save if configured
         if self.save_file:
-            self.save_conversation()
+            self._append_to_journal(entry)
 
         return entry
 
+    def _append_to_journal(self, entry: ConversationEntry):
+        """Queue one entry for the journal, compacting it once it outgrows the history"""
+        try:
+            if self._journal_fd is None:
+                Path(self.journal_file).parent.mkdir(parents=True, exist_ok=True)
+                self._journal_fd = os.open(self.journal_file,
+                                           os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+                self._writer_thread = threading.Thread(
+                    target=self._writer_loop,
+                    daemon=True,
+                    name="ConversationWriter"
+                )
+                self._writer_thread.start()
+
+            self._write_q.put(_dumps_line(entry.to_dict()) + b'\n')
+            self._journal_count += 1
+
+        except Exception as e:
+            print(f"❌ Error saving conversation entry: {e}")
+            return
+
+        # Everything older than max_entries is dead weight in the journal
+        if self._journal_count > self.max_entries:
+            self.save_conversation()
+
+    def _writer_loop(self):
+        """Write queued journal lines in batches: one writev + one fdatasync per batch"""
+        sync = getattr(os, 'fdatasync', os.fsync)
+        while True:
+            batch = [self._write_q.get()]
+
+            # Gather whatever else arrives within 50 ms (up to 16 lines)
+            deadline = time.monotonic() + 0.05
+            while len(batch) < 16:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._write_q.get(timeout=timeout))
+                except queue.Empty:
+                    break
+
+            try:
+                with self._journal_lock:
+                    os.writev(self._journal_fd, batch)
+                    sync(self._journal_fd)
+            except OSError as e:
+                print(f"❌ Error writing conversation journal: {e}")
+            finally:
+                for _ in batch:
+                    self._write_q.task_done()
+
     def add_user_message(self, content: str, metadata: Optional[Dict] = None) -> ConversationEntry:
         """Add a user message"""
         return self.add_entry("user", content, metadata)
@@ -82,7 +194,7 @@ class ConversationManager:
 
     def get_recent_entries(self, count: int = 10) -> List[ConversationEntry]:
         """Get the most recent conversation entries"""
-        return self.entries[-count:] if self.entries else []
+        return list(islice(self.entries, max(0, len(self.entries) - count), None))
 
     def get_context_for_llm(self, max_entries: int = 8) -> List[Dict[str, str]]:
         """Get conversation context formatted for LLM"""
@@ -105,6 +217,7 @@ class ConversationManager:
     def clear_history(self):
         """Clear all conversation history"""
         self.entries.clear()
+        self._role_counts.clear()
         if self.save_file:
             self.save_conversation()
         print("🧹 Conversation history cleared")
@@ -114,8 +227,8 @@ class ConversationManager:
         if not self.entries:
             return {"total_entries": 0, "user_messages": 0, "assistant_messages": 0}
 
-        user_count = sum(1 for entry in self.entries if entry.role == "user")
-        assistant_count = sum(1 for entry in self.entries if entry.role == "assistant")
+        user_count = self._role_counts["user"]
+        assistant_count = self._role_counts["assistant"]
 
         first_entry = self.entries[0] if self.entries else None
         last_entry = self.entries[-1] if self.entries else None
@@ -135,20 +248,21 @@ class ConversationManager:
 
     def search_entries(self, query: str, case_sensitive: bool = False) -> List[ConversationEntry]:
         """Search conversation entries by content"""
-        results = []
-        search_query = query if case_sensitive else query.lower()
-
-        for entry in self.entries:
-            content = entry.content if case_sensitive else entry.content.lower()
-            if search_query in content:
-                results.append(entry)
+        if case_sensitive:
+            return [entry for entry in self.entries if query in entry.content]
 
-        return results
+        search_query = query.lower()
+        return [entry for entry in self.entries if search_query in entry.content_lower]
 
     def get_entries_by_timeframe(self, minutes_ago: int) -> List[ConversationEntry]:
         """Get entries from a specific timeframe"""
         cutoff_time = time.time() - (minutes_ago * 60)
-        return [entry for entry in self.entries if entry.timestamp >= cutoff_time]
+        return list(islice(self.entries, self._index_after(cutoff_time), None))
+
+    def _index_after(self, cutoff_time: float) -> int:
+        """Index of the first entry at or after cutoff_time"""
+        # Entries are appended in time order, so the cutoff is a binary search away
+        return bisect.bisect_left(self.entries, cutoff_time, key=lambda entry: entry.timestamp)
 
     def export_conversation(self, format: str = "json") -> str:
         """Export conversation in different formats"""
@@ -161,54 +275,54 @@ class ConversationManager:
         else:
             raise ValueError(f"Unsupported export format: {format}")
 
-    def _export_json(self) -> str:
-        """Export conversation as JSON"""
-        data = {
+    def _snapshot(self) -> Dict[str, Any]:
+        """Build the data written by JSON export and save"""
+        return {
             "session_id": self.session_id,
             "export_time": datetime.now().isoformat(),
             "stats": self.get_stats(),
             "entries": [entry.to_dict() for entry in self.entries]
         }
-        return json.dumps(data, indent=2)
+
+    def _export_json(self) -> str:
+        """Export conversation as JSON"""
+        return _dumps(self._snapshot()).decode('utf-8')
 
     def _export_text(self) -> str:
         """Export conversation as plain text"""
-        lines = [f"Conversation Session: {self.session_id}"]
-        lines.append(f"Exported: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("=" * 50)
-        lines.append("")
+        out = io.StringIO()
+        out.write(f"Conversation Session: {self.session_id}\n")
+        out.write(f"Exported: {datetime.now():%Y-%m-%d %H:%M:%S}\n")
+        out.write("=" * 50 + "\n")
 
         for entry in self.entries:
-            timestamp = entry.get_datetime().strftime("%H:%M:%S")
-            role = entry.role.title()
-            lines.append(f"[{timestamp}] {role}: {entry.content}")
+            timestamp = entry.get_datetime()
+            out.write(f"\n[{timestamp:%H:%M:%S}] {entry.role.title()}: {entry.content}")
 
-        return "\n".join(lines)
+        return out.getvalue()
 
     def _export_markdown(self) -> str:
         """Export conversation as Markdown"""
-        lines = [f"# Conversation Session: {self.session_id}"]
-        lines.append(f"**Exported:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("")
+        out = io.StringIO()
+        out.write(f"# Conversation Session: {self.session_id}\n")
+        out.write(f"**Exported:** {datetime.now():%Y-%m-%d %H:%M:%S}\n")
+        out.write("\n")
 
-        current_date = None
-        for entry in self.entries:
-            entry_date = entry.get_datetime().date()
-            if current_date != entry_date:
-                current_date = entry_date
-                lines.append(f"## {entry_date.strftime('%Y-%m-%d')}")
-                lines.append("")
+        assistant_heading = ROLE_MARKDOWN["assistant"]
+        # One datetime per entry serves both the day grouping and the time
+        timed_entries = ((entry.get_datetime(), entry) for entry in self.entries)
+        for entry_date, day in groupby(timed_entries, key=lambda pair: pair[0].date()):
+            out.write(f"## {entry_date:%Y-%m-%d}\n\n")
 
-            timestamp = entry.get_datetime().strftime("%H:%M:%S")
-            role = "🗣️ **User**" if entry.role == "user" else "🤖 **Assistant**"
-            lines.append(f"### {timestamp} - {role}")
-            lines.append(f"{entry.content}")
-            lines.append("")
+            for timestamp, entry in day:
+                role = ROLE_MARKDOWN.get(entry.role, assistant_heading)
+                out.write(f"### {timestamp:%H:%M:%S} - {role}\n{entry.content}\n\n")
 
-        return "\n".join(lines)
+        # Same layout as joining the lines with "\n" (no trailing newline)
+        return out.getvalue()[:-1]
 
     def save_conversation(self):
-        """Save conversation to file"""
+        """Save a full snapshot to file and empty the append journal"""
         if not self.save_file:
             return
 
@@ -216,9 +330,20 @@ class ConversationManager:
             # Ensure directory exists
             Path(self.save_file).parent.mkdir(parents=True, exist_ok=True)
 
-            # Save as JSON
-            with open(self.save_file, 'w', encoding='utf-8') as f:
-                f.write(self._export_json())
+            # Let queued journal lines land first so none are written after the truncate
+            self._write_q.join()
+
+            with self._journal_lock:
+                # Save as JSON (bytes straight from the serializer)
+                with open(self.save_file, 'wb') as f:
+                    f.write(_dumps(self._snapshot()))
+
+                # The snapshot now holds every journaled entry
+                if self._journal_fd is not None:
+                    os.ftruncate(self._journal_fd, 0)
+                elif Path(self.journal_file).exists():
+                    open(self.journal_file, 'wb').close()
+                self._journal_count = 0
 
             print(f"💾 Conversation saved to {self.save_file}")
 
@@ -226,35 +351,69 @@ class ConversationManager:
             print(f"❌ Error saving conversation: {e}")
 
     def load_conversation(self):
-        """Load conversation from file"""
-        if not self.save_file or not Path(self.save_file).exists():
+        """Load conversation from the snapshot file plus its append journal"""
+        if not self.save_file:
             return
 
         try:
-            with open(self.save_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            # Load entries
-            self.entries = [ConversationEntry.from_dict(entry_data)
-                          for entry_data in data.get("entries", [])]
-
-            # Load session info if available
-            if "session_id" in data:
-                self.session_id = data["session_id"]
+            # Bounded like self.entries, so replaying a long journal never
+            # holds more than max_entries entries
+            entries = deque(maxlen=self.max_entries)
+            if Path(self.save_file).exists():
+                with open(self.save_file, 'rb') as f:
+                    data = _loads(f.read())
+
+                # Load entries
+                entries.extend(ConversationEntry.from_dict(entry_data)
+                               for entry_data in data.get("entries", []))
+
+                # Load session info if available
+                if "session_id" in data:
+                    self.session_id = data["session_id"]
+
+            # Replay entries added since the last snapshot
+            self._journal_count = 0
+            torn = False
+            if Path(self.journal_file).exists():
+                with open(self.journal_file, 'rb') as f:
+                    size = os.fstat(f.fileno()).st_size
+                    # Scan a read-only mapping line by line; only one record
+                    # is copied out at a time (empty files can't be mapped)
+                    if size:
+                        with mmap.mmap(f.fileno(), 0, prot=mmap.PROT_READ) as mm:
+                            start = 0
+                            while start < size:
+                                end = mm.find(b'\n', start)
+                                if end == -1:
+                                    end = size
+                                try:
+                                    entries.append(ConversationEntry.from_dict(_loads(mm[start:end])))
+                                    self._journal_count += 1
+                                except ValueError:
+                                    torn = True  # Partial line from an interrupted write
+                                start = end + 1
+
+            self.entries = entries
+            self._role_counts = Counter(entry.role for entry in self.entries)
 
             print(f"📂 Loaded {len(self.entries)} conversation entries from {self.save_file}")
 
+            # Don't append new entries after a partial line
+            if torn:
+                self.save_conversation()
+
         except Exception as e:
             print(f"❌ Error loading conversation: {e}")
 
     def cleanup_old_entries(self, max_age_hours: int = 24):
         """Remove entries older than specified hours"""
         cutoff_time = time.time() - (max_age_hours * 3600)
-        original_count = len(self.entries)
 
-        self.entries = [entry for entry in self.entries if entry.timestamp >= cutoff_time]
+        # Old entries are all at the front - find where they end and drop just those
+        removed_count = self._index_after(cutoff_time)
+        for _ in range(removed_count):
+            self._role_counts[self.entries.popleft().role] -= 1
 
-        removed_count = original_count - len(self.entries)
         if removed_count > 0:
             print(f"🧹 Removed {removed_count} old conversation entries")
             if self.save_file:
@@ -287,4 +446,38 @@ class ConversationSummarizer:
         summary = (f"Conversation with {user_count} user messages and "
                   f"{assistant_count} assistant responses {duration_text}.")
 
-        return summary[:max_length]
\ No newline at end of file
+        return summary[:max_length]
+
+def test_conversation_manager():
+    """Check that role counts match the stored entries as the history fills up"""
+    print("Testing ConversationManager role counts:")
+    print("=" * 60)
+
+    passed = 0
+    failed = 0
+
+    for max_entries in (0, 1, 3):
+        manager = ConversationManager(max_entries=max_entries)
+        for i in range(5):
+            manager.add_entry("user" if i % 2 == 0 else "assistant", f"message {i}")
+
+        stored = Counter(entry.role for entry in manager.entries)
+        counted = +manager._role_counts  # Drop zero counts
+        ok = counted == stored and sum(counted.values()) == len(manager.entries)
+        status = "✅" if ok else "❌"
+
+        if ok:
+            passed += 1
+        else:
+            failed += 1
+
+        print(f"{status} max_entries={max_entries}: {len(manager.entries)} stored, "
+              f"counts {dict(counted)}")
+
+    print("=" * 60)
+    print(f"Results: {passed} passed, {failed} failed")
+
+    return failed == 0
+
+if __name__ == "__main__":
+    test_conversation_manager()
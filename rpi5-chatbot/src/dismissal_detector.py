@@ -7,7 +7,16 @@ to sleep mode after the response is complete.
 """
 
 import re
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+
+# Cheap hint that an utterance is Portuguese: accented letters or common words
+PORTUGUESE_HINT = re.compile(r'[áàâãéêíóôõúç]|\b(?:tchau|ate|valeu|falou|pode|vai|vou|obrigad[oa])\b')
+
+def _alternation(patterns: List[str]) -> Optional[re.Pattern]:
+    """Compile patterns into one case-insensitive alternation (None if empty)"""
+    if not patterns:
+        return None
+    return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns), re.IGNORECASE)
 
 class DismissalDetector:
     """Detects dismissal phrases that indicate end of conversation"""
@@ -55,50 +64,69 @@ class DismissalDetector:
             r'\bstop\s+listening\b',
         ]
 
+        self._compile()
+
+    def _compile(self):
+        """Compile the individual patterns and one alternation per language"""
         # Compile all patterns (case-insensitive)
         self.compiled_patterns = [
             re.compile(pattern, re.IGNORECASE)
             for pattern in (self.portuguese_patterns + self.english_patterns)
         ]
 
-    def is_dismissal(self, text: str) -> bool:
+        # One alternation lets the regex engine check a language's phrases in one pass
+        self._portuguese_regex = _alternation(self.portuguese_patterns)
+        self._english_regex = _alternation(self.english_patterns)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Strip and lowercase text the way the matchers expect it"""
+        return text.strip().lower() if text else ''
+
+    def is_dismissal(self, text: str, normalized: Optional[str] = None) -> bool:
         """
         Check if text contains dismissal phrase
 
         Args:
             text: User's transcribed speech
+            normalized: normalize(text), if the caller already has it
 
         Returns:
             True if dismissal detected, False otherwise
         """
+        text = self.normalize(text) if normalized is None else normalized
         if not text:
             return False
 
-        text = text.strip().lower()
-
-        # Check against all patterns
-        for pattern in self.compiled_patterns:
-            if pattern.search(text):
-                return True
+        # Try the likely language first and stop at the first hit
+        if PORTUGUESE_HINT.search(text):
+            regexes = (self._portuguese_regex, self._english_regex)
+        else:
+            regexes = (self._english_regex, self._portuguese_regex)
 
-        return False
+        return any(regex.search(text) for regex in regexes if regex is not None)
 
-    def get_matched_patterns(self, text: str) -> List[str]:
+    def get_matched_patterns(self, text: str, normalized: Optional[str] = None) -> List[str]:
         """
         Get all dismissal patterns that matched the text (for debugging)
 
         Args:
             text: User's transcribed speech
+            normalized: normalize(text), if the caller already has it
 
         Returns:
             List of matched pattern strings
         """
+        text = self.normalize(text) if normalized is None else normalized
         if not text:
             return []
 
-        text = text.strip().lower()
         matched = []
 
+        # Most utterances match nothing - skip the per-pattern scan for those
+        if not self.is_dismissal(text, text):
+            return matched
+
         all_patterns = self.portuguese_patterns + self.english_patterns
 
         for i, pattern in enumerate(self.compiled_patterns):
@@ -115,16 +143,20 @@ class DismissalDetector:
             pattern: Regular expression pattern to add
             language: "pt" for Portuguese or "en" for English
         """
+        # Compile the new pattern first so a bad regex fails here, not mid-conversation
+        compiled = re.compile(pattern, re.IGNORECASE)
+
+        # compiled_patterns holds the Portuguese patterns, then the English ones.
+        # An alternation can't be extended in place, so only the affected
+        # language's one is rebuilt
         if language == "pt":
+            self.compiled_patterns.insert(len(self.portuguese_patterns), compiled)
             self.portuguese_patterns.append(pattern)
+            self._portuguese_regex = _alternation(self.portuguese_patterns)
         else:
+            self.compiled_patterns.append(compiled)
             self.english_patterns.append(pattern)
-
-        # Recompile all patterns
-        self.compiled_patterns = [
-            re.compile(p, re.IGNORECASE)
-            for p in (self.portuguese_patterns + self.english_patterns)
-        ]
+            self._english_regex = _alternation(self.english_patterns)
 
 def test_dismissal_detector():
     """Test the dismissal detector with various inputs"""
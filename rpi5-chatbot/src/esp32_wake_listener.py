@@ -6,11 +6,24 @@ In testing mode, provides keyboard simulation for testing without hardware.
 """
 
 import serial
+import logging
+import re
+import selectors
+import sys
 import threading
 import time
 from typing import Optional, Callable
 from enum import Enum
 
+# Raw serial chatter goes to a logger so it costs nothing unless DEBUG is enabled
+log = logging.getLogger(__name__)
+
+# ESP32 -> Pi protocol messages, matched at the start of each raw serial line.
+# The group name selects the handler in ESP32WakeListener._protocol_handlers
+PROTOCOL_MESSAGE = re.compile(
+    rb'^(?:(?P<wake>WAKE_WORD_DETECTED)|(?P<battery_low>BATTERY_LOW)|(?P<error>ERR_[A-Z_]+))'
+)
+
 class WakeListenerMode(Enum):
     """Operating modes for wake listener"""
     SERIAL = "serial"      # Real ESP32 via serial port
@@ -46,6 +59,13 @@ class ESP32WakeListener:
         # Callbacks
         self._wake_callback: Optional[Callable] = None
 
+        # PROTOCOL_MESSAGE group name -> handler(matched token)
+        self._protocol_handlers = {
+            "wake": self._on_wake_message,
+            "battery_low": self._on_battery_low_message,
+            "error": self._on_error_message,
+        }
+
         # Statistics
         self.wake_count = 0
         self.last_wake_time: Optional[float] = None
@@ -145,23 +165,23 @@ class ESP32WakeListener:
 
         while self._is_running:
             try:
-                if self._serial and self._serial.in_waiting > 0:
-                    line = self._serial.readline().decode('utf-8', errors='ignore').strip()
-
-                    if line:
-                        # Check for wake word signal
-                        if "WAKE_WORD_DETECTED" in line:
-                            print("🎙️  Wake word detected by ESP32!")
-                            self._trigger_wake()
-
-                            # Optional: Send acknowledgment back to ESP32
-                            if self._serial:
-                                self._serial.write(b"ACK_WAKE\n")
-                        else:
-                            # Log other serial output for debugging
-                            print(f"[ESP32] {line}")
-
-                time.sleep(0.01)  # Small delay to avoid busy-waiting
+                if not self._serial:
+                    break
+
+                # Blocks until a line arrives or the 1 s port timeout passes,
+                # so the thread sleeps in the kernel while the ESP32 is quiet
+                raw = self._serial.readline().strip()
+                if not raw:
+                    continue
+
+                # Protocol messages are printed on lines of their own, so one
+                # anchored match on the raw bytes classifies the line
+                match = PROTOCOL_MESSAGE.match(raw)
+                if match:
+                    self._protocol_handlers[match.lastgroup](match.group())
+                elif log.isEnabledFor(logging.DEBUG):
+                    # Log other serial output for debugging
+                    log.debug("[ESP32] %s", raw.decode('utf-8', errors='ignore'))
 
             except serial.SerialException as e:
                 print(f"❌ Serial error: {e}")
@@ -170,24 +190,53 @@ class ESP32WakeListener:
                 print(f"❌ Error in serial listener: {e}")
                 time.sleep(1)
 
+    def _on_wake_message(self, token: bytes):
+        """Handle WAKE_WORD_DETECTED"""
+        print("🎙️  Wake word detected by ESP32!")
+        self._trigger_wake()
+
+        # Optional: Send acknowledgment back to ESP32
+        if self._serial:
+            self._serial.write(b"ACK_WAKE\n")
+
+    def _on_battery_low_message(self, token: bytes):
+        """Handle BATTERY_LOW"""
+        print("⚠️  ESP32 reports low battery")
+
+    def _on_error_message(self, token: bytes):
+        """Handle ERR_* codes"""
+        print(f"❌ ESP32 error: {token.decode('ascii')}")
+
     def _keyboard_listener(self):
         """Keyboard input listener thread (for testing)"""
         print("👂 Keyboard wake listener ready...")
 
-        while self._is_running:
+        # Wait on stdin with a timeout instead of blocking in input(),
+        # so stop() can end this thread without an Enter press
+        with selectors.DefaultSelector() as selector:
             try:
-                user_input = input()
-
-                if user_input.strip().lower() == 'w':
-                    print("⌨️  Simulated wake word detected!")
-                    self._trigger_wake()
-
-            except EOFError:
-                # Input stream closed
-                break
-            except Exception as e:
-                print(f"❌ Error in keyboard listener: {e}")
-                time.sleep(1)
+                selector.register(sys.stdin, selectors.EVENT_READ)
+            except (ValueError, OSError) as e:
+                print(f"❌ Cannot watch stdin for keyboard input: {e}")
+                return
+
+            while self._is_running:
+                try:
+                    if not selector.select(timeout=0.5):
+                        continue
+
+                    user_input = sys.stdin.readline()
+                    if not user_input:
+                        # Input stream closed
+                        break
+
+                    if user_input.strip().lower() == 'w':
+                        print("⌨️  Simulated wake word detected!")
+                        self._trigger_wake()
+
+                except Exception as e:
+                    print(f"❌ Error in keyboard listener: {e}")
+                    time.sleep(1)
 
     def _trigger_wake(self):
         """Trigger wake callback"""
@@ -4,8 +4,9 @@ Raspberry Pi 5 compatible LED control with pattern support
 """
 
 from gpiozero import PWMLED
+import math
+import os
 import threading
-import time
 from typing import Optional, Dict
 from enum import Enum
 
@@ -16,10 +17,48 @@ class LEDPattern(Enum):
     PULSE = "pulse"      # Breathing effect (2s cycle)
     DIM = "dim"          # 30% brightness
 
+PULSE_STEP_SECONDS = 0.02  # Pattern scheduler tick (50 Hz)
+PULSE_PERIOD_SECONDS = 2.0  # One full fade in + fade out
+
+# Brightness for each tick of a pulse cycle (cosine ease in/out), computed once
+_PULSE_STEPS = round(PULSE_PERIOD_SECONDS / PULSE_STEP_SECONDS)
+_PULSE_LUT = tuple(0.5 - 0.5 * math.cos(2 * math.pi * i / _PULSE_STEPS)
+                   for i in range(_PULSE_STEPS))
+
+SCHEDULER_CPU = 0  # Core the pattern scheduler thread is pinned to
+SCHEDULER_FIFO_PRIORITY = 5  # Below the audio threads (10) so playback still wins
+
+def _pin_scheduler_thread():
+    """
+    Pin the calling thread to SCHEDULER_CPU and raise its priority
+    (SCHED_FIFO, else nice -5). Best effort: each step is skipped when the
+    platform or missing CAP_SYS_NICE doesn't allow it.
+    """
+    # pid 0 = the calling thread on Linux
+    try:
+        os.sched_setaffinity(0, {SCHEDULER_CPU})
+    except (AttributeError, OSError):
+        pass
+
+    try:
+        os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(SCHEDULER_FIFO_PRIORITY))
+        return
+    except (AttributeError, OSError):
+        pass
+
+    try:
+        os.nice(-5)
+    except (AttributeError, OSError):
+        pass
+
 class LEDController:
     """
     Controls individual LEDs for chatbot state visualization
     Uses gpiozero library for clean API and built-in PWM support
+
+    Pulses are driven by one scheduler thread, pinned to SCHEDULER_CPU and
+    given SCHED_FIFO (or nice -5) when the process has CAP_SYS_NICE, so fades
+    stay smooth while the LLM and audio threads load the other cores.
     """
 
     def __init__(self,
@@ -38,10 +77,13 @@ class LEDController:
         if yellow_pin:
             self.leds['yellow'] = PWMLED(yellow_pin)
 
-        # Pattern control
-        self._pattern_threads: Dict[str, threading.Thread] = {}
-        self._stop_events: Dict[str, threading.Event] = {}
+        # Pattern control: one scheduler thread animates every pulsing LED.
+        # color -> {"index": position in _PULSE_LUT}, only touched under self._lock
+        self._active_patterns: Dict[str, dict] = {}
         self._lock = threading.Lock()
+        self._scheduler_thread: Optional[threading.Thread] = None  # Started on first pulse
+        self._scheduler_stop = threading.Event()
+        self._patterns_changed = threading.Event()  # Wakes an idle scheduler
 
         # Turn off all LEDs on init
         self.all_off()
@@ -84,51 +126,41 @@ class LEDController:
         elif pattern == LEDPattern.DIM:
             led.value = 0.3  # 30% brightness
         elif pattern == LEDPattern.PULSE:
-            self._start_pulse_thread(color)
-
-    def _start_pulse_thread(self, color: str):
-        """Start breathing/pulsing effect thread"""
-        self._stop_pattern_thread(color)
+            self._start_pulse(color)
 
-        stop_event = threading.Event()
-        self._stop_events[color] = stop_event
-
-        thread = threading.Thread(
-            target=self._pulse_worker,
-            args=(color, stop_event),
-            daemon=True
-        )
-        self._pattern_threads[color] = thread
-        thread.start()
-
-    def _pulse_worker(self, color: str, stop_event: threading.Event):
-        """Breathing effect worker - smooth fade in/out"""
-        led = self.leds[color]
-        while not stop_event.is_set():
-            # Fade in (1 second)
-            for i in range(0, 100, 2):
-                if stop_event.is_set():
-                    break
-                led.value = i / 100.0
-                time.sleep(0.02)
-
-            # Fade out (1 second)
-            for i in range(100, 0, -2):
-                if stop_event.is_set():
-                    break
-                led.value = i / 100.0
-                time.sleep(0.02)
-
-    def _stop_pattern_thread(self, color: str):
-        """Stop pattern thread for specific LED"""
-        if color in self._stop_events:
-            self._stop_events[color].set()
-
-        if color in self._pattern_threads:
-            thread = self._pattern_threads[color]
-            if thread.is_alive():
-                thread.join(timeout=1.0)
-            del self._pattern_threads[color]
+    def _start_pulse(self, color: str):
+        """Hand an LED to the pattern scheduler for the breathing effect"""
+        with self._lock:
+            self._active_patterns[color] = {"index": 0}
+
+            if self._scheduler_thread is None:
+                self._scheduler_thread = threading.Thread(
+                    target=self._scheduler_loop,
+                    daemon=True,
+                    name="LEDPatternScheduler"
+                )
+                self._scheduler_thread.start()
+
+        self._patterns_changed.set()
+
+    def _scheduler_loop(self):
+        """Advance every pulsing LED one step per tick - smooth fade in/out"""
+        _pin_scheduler_thread()
+
+        while not self._scheduler_stop.is_set():
+            with self._lock:
+                for color, state in self._active_patterns.items():
+                    index = state["index"]
+                    self.leds[color].value = _PULSE_LUT[index]
+                    state["index"] = (index + 1) % _PULSE_STEPS
+                active = bool(self._active_patterns)
+
+            if active:
+                self._scheduler_stop.wait(PULSE_STEP_SECONDS)
+            else:
+                # Nothing pulsing - sleep until a pattern starts (or cleanup)
+                self._patterns_changed.wait()
+                self._patterns_changed.clear()
 
     def _set_white_dim(self):
         """Simulate white LED using RGB at low brightness"""
@@ -139,9 +171,8 @@ class LEDController:
     def all_off(self):
         """Turn off all LEDs and stop all patterns"""
         with self._lock:
-            # Stop all pattern threads
-            for color in list(self._pattern_threads.keys()):
-                self._stop_pattern_thread(color)
+            # Stop all patterns (the scheduler only writes LEDs under this lock)
+            self._active_patterns.clear()
 
             # Turn off all LEDs
             for led in self.leds.values():
@@ -150,6 +181,13 @@ class LEDController:
     def cleanup(self):
         """Clean up GPIO resources"""
         self.all_off()
+
+        # Stop the pattern scheduler before its LEDs are closed
+        self._scheduler_stop.set()
+        self._patterns_changed.set()
+        if self._scheduler_thread and self._scheduler_thread.is_alive():
+            self._scheduler_thread.join(timeout=1.0)
+
         for led in self.leds.values():
             led.close()
         print("🧹 LED controller cleaned up")
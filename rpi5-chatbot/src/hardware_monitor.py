@@ -10,7 +10,7 @@ Provides comprehensive system resource monitoring including:
 """
 
 import psutil
-import subprocess
+import requests
 import time
 import platform
 from typing import Optional, Dict, List, Tuple
@@ -19,10 +19,20 @@ from typing import Optional, Dict, List, Tuple
 class HardwareMonitor:
     """Monitor system resources during LLM inference"""
 
-    def __init__(self):
-        """Initialize hardware monitor"""
+    def __init__(self, ollama_url: str = "http://localhost:11434"):
+        """
+        Initialize hardware monitor
+
+        Args:
+            ollama_url: Base URL of the Ollama server
+        """
+        self.ollama_url = ollama_url
         self.ollama_process: Optional[psutil.Process] = None
         self.platform_info = self._detect_platform()
+        # Keep-alive connection for the Ollama API queries made on every snapshot
+        self._session = requests.Session()
+        # Open CPU sample from begin_cpu_sample(): (start time, per-core start) or None
+        self._cpu_sample: Optional[Tuple[float, List[float]]] = None
 
     def _detect_platform(self) -> Dict[str, str]:
         """
@@ -57,22 +67,32 @@ class HardwareMonitor:
         """
         Find the running Ollama server process
 
+        The process found last time is reused while it is still running
+        (is_running() also catches PID reuse), so /proc is only scanned
+        when Ollama (re)starts.
+
         Returns:
             psutil.Process object for Ollama, or None if not found
         """
-        for proc in psutil.process_iter(['pid', 'name', 'cmdline']):
+        if self.ollama_process is not None:
+            try:
+                if self.ollama_process.is_running():
+                    return self.ollama_process
+            except psutil.Error:
+                pass
+            self.ollama_process = None
+
+        # Only fetch names up front - cmdline costs an extra /proc read per
+        # process, so it's read just for processes named like ollama
+        for proc in psutil.process_iter(['name']):
             try:
-                # Check if process name contains 'ollama'
-                if proc.info['name'] and 'ollama' in proc.info['name'].lower():
-                    # Verify it's the server (not a client command)
-                    cmdline = proc.info.get('cmdline', [])
-                    if cmdline and 'serve' in ' '.join(cmdline).lower():
-                        self.ollama_process = psutil.Process(proc.info['pid'])
-                        return self.ollama_process
-
-                # Also check if just 'ollama' binary running
-                if proc.info['name'] == 'ollama':
-                    self.ollama_process = psutil.Process(proc.info['pid'])
+                name = proc.info['name']
+                if not name or 'ollama' not in name.lower():
+                    continue
+
+                # The 'ollama' binary itself, or a server (not a client command)
+                if name == 'ollama' or 'serve' in ' '.join(proc.cmdline()).lower():
+                    self.ollama_process = proc
                     return self.ollama_process
 
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
@@ -87,18 +107,18 @@ class HardwareMonitor:
         Returns:
             Dict with memory metrics in MB
         """
-        if not self.ollama_process:
-            self.find_ollama_process()
-
-        if not self.ollama_process:
+        if not self.find_ollama_process():
             return {'rss_mb': 0.0, 'vms_mb': 0.0, 'available': False}
 
         try:
-            mem_info = self.ollama_process.memory_info()
+            # oneshot() lets memory_percent() reuse the memory_info() read
+            with self.ollama_process.oneshot():
+                mem_info = self.ollama_process.memory_info()
+                percent = self.ollama_process.memory_percent()
             return {
                 'rss_mb': round(mem_info.rss / (1024**2), 2),  # Resident Set Size
                 'vms_mb': round(mem_info.vms / (1024**2), 2),  # Virtual Memory Size
-                'percent': round(self.ollama_process.memory_percent(), 2),
+                'percent': round(percent, 2),
                 'available': True
             }
         except (psutil.NoSuchProcess, psutil.AccessDenied):
@@ -132,33 +152,48 @@ class HardwareMonitor:
             'available': True
         }
 
-    def measure_cpu_usage(self, duration: float = 1.0, per_core: bool = True) -> Dict[str, any]:
+    def begin_cpu_sample(self) -> bool:
         """
-        Measure CPU usage during inference
+        Start a CPU measurement without waiting
 
-        Args:
-            duration: Time to sample CPU (seconds)
-            per_core: Whether to include per-core breakdown
+        Run the work to be measured (e.g. inference) and then call
+        end_cpu_sample() - the sample covers everything in between.
 
         Returns:
-            Dict with CPU metrics
+            True if the Ollama process was found and sampling started
         """
-        if not self.ollama_process:
-            self.find_ollama_process()
-
-        if not self.ollama_process:
-            return {'average': 0.0, 'available': False}
+        if not self.find_ollama_process():
+            self._cpu_sample = None
+            return False
 
         try:
             # Initialize CPU measurement (first call always returns 0.0)
             self.ollama_process.cpu_percent(interval=None)
-
             # Sample system-wide per-core CPU at start
-            if per_core:
-                cpu_start = psutil.cpu_percent(interval=None, percpu=True)
+            cpu_start = psutil.cpu_percent(interval=None, percpu=True)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            self._cpu_sample = None
+            return False
+
+        self._cpu_sample = (time.monotonic(), cpu_start)
+        return True
+
+    def end_cpu_sample(self, per_core: bool = True) -> Dict[str, any]:
+        """
+        Finish the measurement started by begin_cpu_sample()
+
+        Args:
+            per_core: Whether to include per-core breakdown
 
-            # Wait and measure process CPU
-            time.sleep(max(0.1, duration))  # Minimum 0.1s for accuracy
+        Returns:
+            Dict with CPU metrics
+        """
+        sample, self._cpu_sample = self._cpu_sample, None
+        if sample is None or not self.ollama_process:
+            return {'average': 0.0, 'available': False}
+
+        started, cpu_start = sample
+        try:
             process_cpu = self.ollama_process.cpu_percent(interval=None)
 
             # Sample system-wide per-core CPU at end
@@ -172,46 +207,50 @@ class HardwareMonitor:
 
             return {
                 'average': round(process_cpu, 2),
-                'per_core': per_core_usage if per_core else [],
+                'per_core': per_core_usage,
                 'cpu_count': self.platform_info['cpu_count'],
+                'duration': round(time.monotonic() - started, 3),
                 'available': True
             }
 
         except (psutil.NoSuchProcess, psutil.AccessDenied):
             return {'average': 0.0, 'available': False}
 
+    def measure_cpu_usage(self, duration: float = 1.0, per_core: bool = True) -> Dict[str, any]:
+        """
+        Measure CPU usage by sampling for a fixed time (blocks for `duration`)
+
+        Prefer begin_cpu_sample()/end_cpu_sample() around real work.
+
+        Args:
+            duration: Time to sample CPU (seconds)
+            per_core: Whether to include per-core breakdown
+
+        Returns:
+            Dict with CPU metrics
+        """
+        if not self.begin_cpu_sample():
+            return {'average': 0.0, 'available': False}
+
+        time.sleep(max(0.1, duration))  # Minimum 0.1s for accuracy
+        return self.end_cpu_sample(per_core=per_core)
+
     def get_ollama_running_models(self) -> List[str]:
         """
-        Get list of currently loaded models via 'ollama ps'
+        Get list of currently loaded models via the /api/ps endpoint
+        (same data as 'ollama ps', without spawning the CLI)
 
         Returns:
             List of model names currently loaded
         """
         try:
-            result = subprocess.run(
-                ['ollama', 'ps'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-
-            if result.returncode != 0:
+            response = self._session.get(f"{self.ollama_url}/api/ps", timeout=2)
+            if response.status_code != 200:
                 return []
 
-            # Parse output (skip header line)
-            lines = result.stdout.strip().split('\n')[1:]
-            models = []
-
-            for line in lines:
-                if line.strip():
-                    # First column is model name
-                    parts = line.split()
-                    if parts:
-                        models.append(parts[0])
+            return [model['name'] for model in response.json().get('models', [])]
 
-            return models
-
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+        except (requests.exceptions.RequestException, ValueError, KeyError):
             return []
 
     def stop_model(self, model_name: str) -> bool:
@@ -225,29 +264,36 @@ class HardwareMonitor:
             True if successful
         """
         try:
-            result = subprocess.run(
-                ['ollama', 'stop', model_name],
-                capture_output=True,
-                text=True,
+            # keep_alive=0 with no prompt unloads the model, like 'ollama stop'
+            response = self._session.post(
+                f"{self.ollama_url}/api/generate",
+                json={"model": model_name, "keep_alive": 0},
                 timeout=10
             )
-            return result.returncode == 0
-        except (subprocess.TimeoutExpired, FileNotFoundError):
+            return response.status_code == 200
+        except requests.exceptions.RequestException:
             return False
 
     def create_snapshot(self, label: str = "snapshot", duration: float = 1.0) -> Dict:
         """
         Create a comprehensive snapshot of all metrics
 
+        If begin_cpu_sample() was called earlier, the CPU figures cover the
+        time since then and the snapshot doesn't block. Otherwise CPU is
+        sampled for `duration` seconds.
+
         Args:
             label: Description of this snapshot
-            duration: CPU sampling duration
+            duration: CPU sampling duration when no sample is open
 
         Returns:
             Dict with all available metrics
         """
         memory = self.get_baseline_memory()
-        cpu = self.measure_cpu_usage(duration=duration, per_core=True)
+        if self._cpu_sample is not None:
+            cpu = self.end_cpu_sample(per_core=True)
+        else:
+            cpu = self.measure_cpu_usage(duration=duration, per_core=True)
         running_models = self.get_ollama_running_models()
 
         return {
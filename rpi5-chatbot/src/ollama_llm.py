@@ -4,15 +4,55 @@ Language Model module using Ollama
 
 import requests
 import json
-from typing import Optional, List, Dict, Any
+import re
+from collections import deque
+from typing import Optional, Deque, List, Dict, Any
 import config
 
+# orjson is optional - it encodes/decodes the per-token JSON several times faster
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+_WS_RE = re.compile(r'\s+')
+
+MAX_HISTORY = 20  # Messages kept in conversation_history (10 exchanges)
+
 class OllamaLLM:
     """Handles language model inference using Ollama"""
 
     def __init__(self, ollama_config: config.OllamaConfig):
         self.config = ollama_config
-        self.conversation_history: List[Dict[str, str]] = []
+        # Bounded deque: the oldest message drops off in O(1) once full
+        self.conversation_history: Deque[Dict[str, str]] = deque(maxlen=MAX_HISTORY)
+
+        # One pooled session keeps the loopback connection to Ollama open
+        # between turns instead of reconnecting for every request
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=4)
+        self._session.mount('http://', adapter)
+
+        # System message dict for the last system prompt seen, reused across turns
+        self._last_system_prompt: Optional[str] = None
+        self._system_msg: Optional[Dict[str, str]] = None
+
+        # Request bodies minus "messages", built once - the config is frozen,
+        # so only the messages change from call to call
+        options = {
+            "temperature": self.config.temperature,
+            "num_predict": self.config.max_tokens,
+        }
+        self._payload_base = {"model": self.config.model, "stream": False, "options": options}
+        self._stream_payload_base = {**self._payload_base, "stream": True}
+        self._warm_up_payload = {
+            "model": self.config.model,
+            "messages": [{"role": "user", "content": "Hi"}],
+            "stream": False,
+            "options": {"num_predict": 1, "temperature": 0.1},
+        }
 
     def generate_response(self, prompt: str, system_prompt: Optional[str] = None, max_retries: int = 2) -> Optional[str]:
         """Generate a response from the language model with retry logic using /chat endpoint"""
@@ -21,22 +61,14 @@ class OllamaLLM:
                 # Build messages for chat endpoint
                 messages = self._build_messages(prompt, system_prompt)
 
-                payload = {
-                    "model": self.config.model,
-                    "messages": messages,
-                    "stream": False,
-                    "options": {
-                        "temperature": self.config.temperature,
-                        "num_predict": self.config.max_tokens,
-                    }
-                }
+                payload = {**self._payload_base, "messages": messages}
 
                 print(f"🤖 Sending to Ollama ({self.config.model})..." + (f" (attempt {attempt + 1})" if attempt > 0 else ""))
                 print(f"📝 User message (len={len(prompt)}): '{prompt[:100]}{'...' if len(prompt) > 100 else ''}'")
 
-                response = requests.post(
+                response = self._post_json(
                     self.config.url,
-                    json=payload,
+                    payload,
                     timeout=self.config.timeout
                 )
 
@@ -102,34 +134,34 @@ class OllamaLLM:
         try:
             messages = self._build_messages(prompt, system_prompt)
 
-            payload = {
-                "model": self.config.model,
-                "messages": messages,
-                "stream": True,
-                "options": {
-                    "temperature": self.config.temperature,
-                    "num_predict": self.config.max_tokens
-                }
-            }
-
-            response = requests.post(
+            payload = {**self._stream_payload_base, "messages": messages}
+
+            # The connection goes back to the session's pool only if the body
+            # was read to the end. A stream abandoned mid-answer (dismissal,
+            # interruption) is closed instead, which also stops generation
+            with self._post_json(
                 self.config.url,
-                json=payload,
+                payload,
                 timeout=self.config.timeout,
                 stream=True
-            )
+            ) as response:
+                if response.status_code != 200:
+                    return
 
-            if response.status_code == 200:
                 full_response = ""
-                for line in response.iter_lines():
+                for line in self._iter_ndjson(response):
                     if line:
-                        data = json.loads(line)
+                        data = _json_loads(line)
                         if 'message' in data and 'content' in data['message']:
                             chunk = data['message']['content']
                             full_response += chunk
                             yield chunk
 
                         if data.get('done', False):
+                            # Only the end of the chunked body is left - read it
+                            # so the connection can be reused for the next turn
+                            for _ in response.iter_content(chunk_size=None):
+                                pass
                             break
 
                 # Update conversation history with complete response
@@ -142,36 +174,56 @@ class OllamaLLM:
             print(f"❌ Error with streaming Ollama: {e}")
             yield "Sorry, I encountered an error while processing your request."
 
+    @staticmethod
+    def _iter_ndjson(response: requests.Response):
+        """Yield the raw bytes of each newline-delimited record in a streamed response"""
+        buffer = bytearray()
+        # chunk_size=None hands over each chunk as soon as it arrives, so a
+        # token is never held back waiting for a fixed-size read to fill
+        for chunk in response.iter_content(chunk_size=None):
+            buffer += chunk
+            start = 0
+            while (end := buffer.find(b'\n', start)) != -1:
+                yield bytes(buffer[start:end])
+                start = end + 1
+            del buffer[:start]
+        if buffer:
+            yield bytes(buffer)
+
+    def _post_json(self, url: str, payload: Dict[str, Any], **kwargs) -> requests.Response:
+        """POST payload as JSON through the session (serialized by orjson when available)"""
+        if orjson is None:
+            return self._session.post(url, json=payload, **kwargs)
+        return self._session.post(url, data=orjson.dumps(payload),
+                                  headers={"Content-Type": "application/json"}, **kwargs)
+
     def _build_messages(self, user_input: str, system_prompt: Optional[str] = None) -> List[Dict[str, str]]:
         """Build messages array for /chat endpoint"""
-        messages = []
-
-        # Only add system message if provided and non-empty
-        if system_prompt and system_prompt.strip():
-            messages.append({
-                "role": "system",
-                "content": system_prompt
-            })
-
-        # Add user message
-        messages.append({
-            "role": "user",
-            "content": user_input
-        })
+        # The system prompt rarely changes between turns - build its dict once
+        if system_prompt != self._last_system_prompt:
+            self._last_system_prompt = system_prompt
+            # Only add system message if provided and non-empty
+            if system_prompt and system_prompt.strip():
+                self._system_msg = {"role": "system", "content": system_prompt}
+            else:
+                self._system_msg = None
 
-        return messages
+        user_msg = {"role": "user", "content": user_input}
+        if self._system_msg:
+            return [self._system_msg, user_msg]
+        return [user_msg]
 
     def _clean_response(self, response: str) -> str:
         """Clean up the AI response"""
-        # Basic cleaning for base model output
-        response = response.strip()
-
-        # Remove excessive whitespace
-        response = " ".join(response.split())
+        # Remove excessive whitespace (one regex pass, no token list)
+        response = _WS_RE.sub(' ', response).strip()
 
         # Ensure it doesn't end with incomplete words or artifacts
-        if response.endswith(("...", "…")):
-            response = response[:-3].strip()
+        # (a lone '.' is a normal sentence end and is kept)
+        if response.endswith("..."):
+            response = response[:-3].rstrip()
+        elif response.endswith("…"):
+            response = response[:-1].rstrip()
 
         return response
 
@@ -182,11 +234,6 @@ class OllamaLLM:
             "content": content
         })
 
-        # Keep history manageable
-        max_history = 20  # 10 exchanges
-        if len(self.conversation_history) > max_history:
-            self.conversation_history = self.conversation_history[-max_history:]
-
     def clear_history(self):
         """Clear conversation history"""
         self.conversation_history.clear()
@@ -194,32 +241,20 @@ class OllamaLLM:
 
     def get_history(self) -> List[Dict[str, str]]:
         """Get conversation history"""
-        return self.conversation_history.copy()
+        return list(self.conversation_history)
 
     def set_history(self, history: List[Dict[str, str]]):
         """Set conversation history"""
-        self.conversation_history = history
+        self.conversation_history = deque(history, maxlen=MAX_HISTORY)
 
     def warm_up_model(self) -> bool:
         """Warm up the model by making a simple request"""
         try:
             print(f"🔥 Warming up model '{self.config.model}'...")
 
-            warm_up_payload = {
-                "model": self.config.model,
-                "messages": [
-                    {"role": "user", "content": "Hi"}
-                ],
-                "stream": False,
-                "options": {
-                    "num_predict": 1,
-                    "temperature": 0.1
-                }
-            }
-
-            response = requests.post(
+            response = self._post_json(
                 self.config.url,
-                json=warm_up_payload,
+                self._warm_up_payload,
                 timeout=30  # Give more time for initial load
             )
 
@@ -238,7 +273,7 @@ class OllamaLLM:
         """Check if Ollama service is available"""
         try:
             # First check if server is running
-            health_check = requests.get("http://localhost:11434/api/tags", timeout=5)
+            health_check = self._session.get("http://localhost:11434/api/tags", timeout=5)
             if health_check.status_code != 200:
                 return False
 
@@ -264,7 +299,7 @@ class OllamaLLM:
             model_url = f"http://localhost:11434/api/show"
             payload = {"name": self.config.model}
 
-            response = requests.post(model_url, json=payload, timeout=10)
+            response = self._session.post(model_url, json=payload, timeout=10)
 
             if response.status_code == 200:
                 return response.json()
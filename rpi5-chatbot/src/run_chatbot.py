@@ -7,7 +7,9 @@ Simple script to run the voice chatbot with optional customizations
 
 import sys
 import argparse
+import logging
 import re
+from dataclasses import replace
 from pathlib import Path
 
 # Add the chatbot module to Python path
@@ -63,12 +65,12 @@ def create_custom_config(model_name=None, language_mode="native", interaction_mo
             # Use native model (relies on native Portuguese support)
             final_model = model_name
 
-        chatbot_config.ollama.model = final_model
+        chatbot_config.ollama = replace(chatbot_config.ollama, model=final_model)
         print(f"📦 Model: {final_model}")
         print(f"🌐 Language Mode: {'Forced Portuguese (via Modelfile)' if language_mode == 'pt-br' else 'Native Portuguese'}")
 
     # Apply interaction mode
-    chatbot_config.conversation.interaction_mode = interaction_mode
+    chatbot_config.conversation = replace(chatbot_config.conversation, interaction_mode=interaction_mode)
     mode_descriptions = {
         "single-shot": "Single-shot (Alexa-style, best battery)",
         "conversation": "Continuous conversation (original behavior)",
@@ -78,9 +80,9 @@ def create_custom_config(model_name=None, language_mode="native", interaction_mo
 
     # You can customize the configuration here
     # For example:
-    # config.ollama.model = "llama2"
-    # config.audio.silence_threshold = 3.0
-    # config.conversation.system_prompt = "Your custom system prompt"
+    # config.ollama = replace(config.ollama, model="llama2")
+    # config.audio = replace(config.audio, silence_threshold=3.0)
+    # config.conversation = replace(config.conversation, system_prompt="Your custom system prompt")
 
     return chatbot_config
 
@@ -116,6 +118,7 @@ def main():
         default="/dev/ttyACM0",
         help="Serial port for ESP32 wake word (default: /dev/ttyACM0)"
     )
+    parser.add_argument("--serial-debug", action="store_true", help="Print raw ESP32 serial output")
     parser.add_argument(
         "--start-mode",
         type=str,
@@ -141,6 +144,10 @@ def main():
 
     args = parser.parse_args()
 
+    if args.serial_debug:
+        logging.basicConfig(format="%(message)s")
+        logging.getLogger("esp32_wake_listener").setLevel(logging.DEBUG)
+
     # Create configuration with model selection and interaction mode
     chatbot_config = create_custom_config(args.model, args.language, args.interaction_mode)
 
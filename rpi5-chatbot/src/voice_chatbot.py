@@ -291,6 +291,10 @@ class VoiceChatbot:
             # Initialize audio player
             self.audio_player = audio_utils.AudioPlayer()
 
+            # Keep the feedback beeps/tones decoded so they start instantly
+            sounds_dir = Path(__file__).parent.parent / "sounds"
+            self.audio_player.preload(str(path) for path in sorted(sounds_dir.glob("*.wav")))
+
             # Initialize LED controller
             if self.config.gpio.enabled:
                 try:
@@ -455,10 +459,11 @@ class VoiceChatbot:
                 self.whisper_stt.pause_recording()
 
             # Check for dismissal patterns
-            if self.dismissal_detector.is_dismissal(text):
+            normalized = self.dismissal_detector.normalize(text)
+            if self.dismissal_detector.is_dismissal(text, normalized):
                 print("👋 Dismissal detected - will enter sleep after response")
                 self.is_dismissal_pending = True
-                matched = self.dismissal_detector.get_matched_patterns(text)
+                matched = self.dismissal_detector.get_matched_patterns(text, normalized)
                 if matched:
                     print(f"   (Matched pattern: {matched[0]})")
 
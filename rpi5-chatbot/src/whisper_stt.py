@@ -23,6 +23,8 @@ from typing import Optional, Callable
 import numpy as np
 import warnings
 import os
+import re
+from contextlib import contextmanager
 
 # Suppress numpy warnings for sqrt of negative values (happens with silent audio)
 warnings.filterwarnings('ignore', category=RuntimeWarning, module='numpy')
@@ -35,6 +37,26 @@ except ImportError:
 
 import config
 
+# Transcription cleanup patterns (compiled once, used per utterance)
+_WHITESPACE_RE = re.compile(r'\s+')
+_TRAILING_PERIODS_RE = re.compile(r'\.+$')
+
+# /dev/null opened once; ALSA writes its warnings straight to fd 2, so the
+# redirect has to happen at the file-descriptor level
+_DEVNULL_FD = os.open(os.devnull, os.O_WRONLY)
+
+
+@contextmanager
+def _silence_stderr():
+    """Temporarily point fd 2 at /dev/null (silences C-level ALSA output)"""
+    saved_fd = os.dup(2)
+    os.dup2(_DEVNULL_FD, 2)
+    try:
+        yield
+    finally:
+        os.dup2(saved_fd, 2)
+        os.close(saved_fd)
+
 
 class WhisperSTT:
     """Handles speech-to-text using whisper.cpp CLI with VAD - RPI5 Edition"""
@@ -76,14 +98,19 @@ class WhisperSTT:
             return None
 
         try:
+            # Match by name (e.g., "USB" in device_name matches "USB PnP Sound Device")
+            # Only USB devices are matched, so skip enumeration entirely otherwise
+            if 'USB' not in device_name:
+                print(f"⚠️  Could not find device matching '{device_name}', using default")
+                return None
+
             # Search for device by name pattern
             device_count = self.audio.get_device_count()
             for i in range(device_count):
                 info = self.audio.get_device_info_by_index(i)
                 # Check if device supports input
                 if info['maxInputChannels'] > 0:
-                    # Match by name (e.g., "USB" in device_name matches "USB PnP Sound Device")
-                    if 'USB' in device_name and 'USB' in info['name']:
+                    if 'USB' in info['name']:
                         print(f"🎤 Found USB microphone: {info['name']} (index {i})")
                         return i
 
@@ -106,10 +133,8 @@ class WhisperSTT:
                 os.environ['AUDIODEV'] = self.config.capture_device_name
 
             # Suppress ALSA warnings (cosmetic only, doesn't affect functionality)
-            from contextlib import redirect_stderr
-            with open(os.devnull, 'w') as devnull:
-                with redirect_stderr(devnull):
-                    self.audio = pyaudio.PyAudio()
+            with _silence_stderr():
+                self.audio = pyaudio.PyAudio()
 
             # Try to find device by name if configured
             device_index = None
@@ -351,10 +376,8 @@ class WhisperSTT:
 
     def _clean_transcription(self, text: str) -> str:
         """Clean up transcription text"""
-        import re
-
         # Remove extra whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE_RE.sub(' ', text).strip()
 
         # NOTE: Removed aggressive word filtering that was removing legitimate words
         # Previously removed: um|uh|er|ah - but "um" is a valid Portuguese article/number
@@ -362,7 +385,7 @@ class WhisperSTT:
         # The AI model is better at understanding context than regex patterns.
 
         # Remove trailing periods if multiple
-        text = re.sub(r'\.+$', '.', text)
+        text = _TRAILING_PERIODS_RE.sub('.', text)
 
         # Ensure capitalization
         if text and text[0].islower():